@@ -0,0 +1,90 @@
+#
+# Per-host scale factors for the suite runner.
+#
+# In Embench, LOCAL_SCALE_FACTOR * CPU_MHZ is chosen so that every benchmark
+# runs for about the same time. The Python ports copied the C numbers
+# (170 for crc_32, 1478 for ud, 475 for nettle-sha256, ...), which makes
+# their run times differ by orders of magnitude. This module measures the
+# per-iteration cost of every kernel on the current host, derives the
+# repetition count that fills a common wall-clock budget and stores the
+# result in a JSON file that suite.py loads at startup.
+#
+
+import json
+import os
+import platform
+import sys
+import time
+
+import timing
+
+# Default location of the calibration file (next to this file).
+CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calibration.json")
+# Default wall-clock budget of one benchmark run, in seconds.
+BUDGET_SECONDS = 1.0
+
+
+def host_info():
+    """Identifies the host and interpreter a calibration was made on."""
+    return {
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+    }
+
+
+def calibrate(kernels, budget=BUDGET_SECONDS):
+    """
+    Measures every kernel and returns the calibration data: the host info,
+    the budget and, per kernel, its cost in ns/iter and the scale factor
+    (repetition count) that makes one run last 'budget' seconds.
+    """
+    data = {"budget": budget, "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "kernels": {}}
+    data.update(host_info())
+    for kernel in kernels:
+        kernel.initialise()
+        kernel.warm(1)
+        # Calibrate on a tenth of the budget, then scale up.
+        rpt = timing.calibrate_rpt(kernel, budget / 10)
+        elapsed, _ = timing.time_once(kernel, rpt)
+        ns_per_iter = elapsed / rpt
+        data["kernels"][kernel.name] = {
+            "budget": budget,
+            "ns_per_iter": ns_per_iter,
+            "scale": max(1, round(budget * 1e9 / ns_per_iter)),
+        }
+    return data
+
+
+def save(data, path=CALIBRATION_FILE):
+    """Writes calibration data as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path=CALIBRATION_FILE):
+    """
+    Reads calibration data, or returns None when the file does not exist.
+    A warning is printed if it was made on another host or interpreter,
+    since the scale factors are then unlikely to match the budget.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    current = host_info()
+    stale = [key for key in current if data.get(key) != current[key]]
+    if stale:
+        print(f"Warning: {path} was calibrated with a different {', '.join(stale)}; "
+              f"re-run with --calibrate", file=sys.stderr)
+    return data
+
+
+def apply(kernels, data):
+    """Replaces the scale of every calibrated kernel by its calibrated value."""
+    for kernel in kernels:
+        entry = data["kernels"].get(kernel.name)
+        if entry is not None:
+            kernel.scale = entry["scale"]
@@ -2,6 +2,15 @@
 # crc32.py
 # Python port of Embench "crc32" benchmark
 
+import argparse
+import functools
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only used for long PRNG streams
+    np = None
+
 # The polynomial lookup table (same as in C code)
 
 
@@ -51,6 +60,108 @@ crc_32_tab = [
     0xb40bbe37, 0xc30c8ea1, 0x5a05df1b, 0x2d02ef8d
 ]
 
+# This scale factor will be changed to equalize the runtime of the benchmarks.
+LOCAL_SCALE_FACTOR = 170
+CPU_MHZ = 1  # placeholder
+
+# Slicing-by-N tables: table[0] is the classic byte table (same as
+# crc_32_tab), table[k][i] is the CRC of byte i followed by k zero bytes,
+# so 4 or 8 input bytes can be folded in with one lookup per byte and no
+# data-dependent shift chain between them.
+CRC_32_POLY = 0xEDB88320
+
+
+def make_crc_tables(poly=CRC_32_POLY, slices=8):
+    """Generate the slicing-by-N lookup tables for a reflected polynomial."""
+    table0 = []
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = (c >> 1) ^ poly if c & 1 else c >> 1
+        table0.append(c)
+    tables = [table0]
+    for _ in range(1, slices):
+        prev = tables[-1]
+        tables.append([(c >> 8) ^ table0[c & 0xFF] for c in prev])
+    return tables
+
+
+CRC_TABLES = make_crc_tables()
+# Engines of crc32_update: bytes consumed per table step.
+SLICES = (1, 4, 8)
+
+
+def _update_bytewise(crc, data):
+    """Fold bytes into the (inverted) CRC register one at a time."""
+    t0 = CRC_TABLES[0]
+    for octet in data:
+        crc = t0[(crc ^ octet) & 0xFF] ^ (crc >> 8)
+    return crc
+
+
+def _update_slice4(crc, data):
+    """Fold 4 bytes per step; data length must be a multiple of 4."""
+    t0, t1, t2, t3 = CRC_TABLES[:4]
+    for (word,) in struct.iter_unpack("<I", data):
+        crc ^= word
+        crc = t3[crc & 0xFF] ^ t2[(crc >> 8) & 0xFF] ^ t1[(crc >> 16) & 0xFF] ^ t0[crc >> 24]
+    return crc
+
+
+def _update_slice8(crc, data):
+    """Fold 8 bytes per step; data length must be a multiple of 8."""
+    t0, t1, t2, t3, t4, t5, t6, t7 = CRC_TABLES
+    for lo, hi in struct.iter_unpack("<II", data):
+        lo ^= crc
+        crc = (t7[lo & 0xFF] ^ t6[(lo >> 8) & 0xFF] ^ t5[(lo >> 16) & 0xFF] ^ t4[lo >> 24] ^
+               t3[hi & 0xFF] ^ t2[(hi >> 8) & 0xFF] ^ t1[(hi >> 16) & 0xFF] ^ t0[hi >> 24])
+    return crc
+
+
+def crc32_update(crc, data, slices=8):
+    """
+    Continue a CRC-32 over 'data' (bytes, bytearray or memoryview).
+    'crc' is the previous result (0 to start), like zlib.crc32.
+    'slices' selects the engine: 1 (byte table), 4 or 8.
+    """
+    if slices not in SLICES:
+        raise ValueError(f"slices must be one of {SLICES}, not {slices!r}")
+    view = memoryview(data).cast("B")
+    crc = ~crc & 0xFFFFFFFF
+    if slices == 1:
+        crc = _update_bytewise(crc, view)
+    else:
+        bulk = len(view) - len(view) % slices
+        step = _update_slice8 if slices == 8 else _update_slice4
+        crc = step(crc, view[:bulk])
+        crc = _update_bytewise(crc, view[bulk:])
+    return ~crc & 0xFFFFFFFF
+
+
+def crc32(buffer, slices=8):
+    """CRC-32 of a whole buffer."""
+    return crc32_update(0, buffer, slices)
+
+
+class Crc32Ctx:
+    """Streaming CRC-32: feed data with update(), read the CRC with digest()."""
+
+    def __init__(self, slices=8):
+        if slices not in SLICES:
+            raise ValueError(f"slices must be one of {SLICES}, not {slices!r}")
+        self.slices = slices
+        self.crc = 0
+
+    def init(self):
+        self.crc = 0
+
+    def update(self, data):
+        self.crc = crc32_update(self.crc, data, self.slices)
+
+    def digest(self):
+        return self.crc
+
+
 # Embench deterministic PRNG
 _next_beebs = 1
 
@@ -65,6 +176,63 @@ def rand_beebs() -> int:
     _next_beebs = (_next_beebs * 1103515245 + 12345) & 0xFFFFFFFF
     return (_next_beebs >> 16) & 0xFF
 
+# LCG parameters of rand_beebs
+BEEBS_MUL = 1103515245
+BEEBS_INC = 12345
+# Below this length the plain loop is faster than setting up NumPy.
+NUMPY_MIN_LENGTH = 1 << 14
+
+def lcg_jump(steps: int):
+    """
+    Return (mul, inc) such that advancing the rand_beebs state 'steps'
+    times is state -> (mul * state + inc) mod 2**32.
+    """
+    mul, inc = 1, 0
+    step_mul, step_inc = BEEBS_MUL, BEEBS_INC
+    while steps:
+        if steps & 1:
+            mul, inc = (mul * step_mul) & 0xFFFFFFFF, (inc * step_mul + step_inc) & 0xFFFFFFFF
+        step_mul, step_inc = (step_mul * step_mul) & 0xFFFFFFFF, (step_inc * step_mul + step_inc) & 0xFFFFFFFF
+        steps >>= 1
+    return mul, inc
+
+def _beebs_states(seed: int, length: int) -> list:
+    """The first 'length' states after 'seed', computed one by one."""
+    states = []
+    state = seed
+    for _ in range(length):
+        state = (state * BEEBS_MUL + BEEBS_INC) & 0xFFFFFFFF
+        states.append(state)
+    return states
+
+def _beebs_stream_numpy(seed: int, length: int) -> bytes:
+    """
+    Leapfrog generation: the first 'width' states are computed serially,
+    then every following row of 'width' states is the previous row jumped
+    ahead by 'width' steps, which NumPy does for the whole row at once
+    (uint32 arithmetic wraps like the C unsigned int).
+    """
+    width = 1024
+    rows = -(-length // width)
+    mul, inc = lcg_jump(width)
+    states = np.empty((rows, width), dtype=np.uint32)
+    states[0] = _beebs_states(seed, width)
+    mul, inc = np.uint32(mul), np.uint32(inc)
+    for row in range(1, rows):
+        np.add(np.multiply(states[row - 1], mul), inc, out=states[row])
+    return ((states.ravel()[:length] >> 16) & 0xFF).astype(np.uint8).tobytes()
+
+@functools.lru_cache(maxsize=32)
+def rand_beebs_bytes(seed: int, length: int) -> bytes:
+    """
+    The first 'length' rand_beebs() bytes after srand_beebs(seed), in one
+    call and without touching the global generator. Results are memoized
+    per (seed, length).
+    """
+    if np is not None and length >= NUMPY_MIN_LENGTH:
+        return _beebs_stream_numpy(seed, length)
+    return bytes([(state >> 16) & 0xFF for state in _beebs_states(seed, length)])
+
 def crc32pseudo() -> int:
     """Compute a pseudo CRC32 checksum using deterministic random bytes."""
     oldcrc32 = 0xFFFFFFFF
@@ -73,9 +241,18 @@ def crc32pseudo() -> int:
         oldcrc32 = crc_32_tab[(oldcrc32 ^ octet) & 0xFF] ^ (oldcrc32 >> 8)
     return ~oldcrc32 & 0xFFFFFFFF
 
-def benchmark_body(rpt: int) -> int:
-    """Main benchmark loop."""
+def benchmark_body(rpt: int, slices: int = 0) -> int:
+    """
+    Main benchmark loop. slices=0 runs the original crc32pseudo; otherwise
+    the 1024 input bytes are generated once with rand_beebs_bytes and
+    checksummed with crc32() using the given slicing engine.
+    """
     r = 0
+    if slices:
+        data = rand_beebs_bytes(0, 1024)
+        for _ in range(rpt):
+            r = crc32(data, slices)
+        return r % 32768
     for _ in range(rpt):
         srand_beebs(0)  # reset seed each iteration
         r = crc32pseudo()
@@ -83,8 +260,6 @@ def benchmark_body(rpt: int) -> int:
 
 def benchmark() -> int:
     """Run the benchmark."""
-    LOCAL_SCALE_FACTOR = 170
-    CPU_MHZ = 1  # placeholder
     return benchmark_body(LOCAL_SCALE_FACTOR * CPU_MHZ)
 
 def verify_benchmark(r: int) -> bool:
@@ -92,6 +267,10 @@ def verify_benchmark(r: int) -> bool:
     return r == 11433
 
 if __name__ == "__main__":
-    result = benchmark()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slices", type=int, choices=(0, 1, 4, 8), default=0,
+                        help="CRC engine: 0 = original crc32pseudo, 1/4/8 = slicing-by-N crc32()")
+    args = parser.parse_args()
+    result = benchmark_body(LOCAL_SCALE_FACTOR * CPU_MHZ, args.slices)
     print("Benchmark result:", result)
     print("Verification:", verify_benchmark(result))
@@ -1,4 +1,15 @@
-import copy
+import argparse
+import concurrent.futures
+import operator
+import os
+import time
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only needed by the numpy-* engines
+    np = None
 
 # -------------------------------
 # Constants
@@ -43,6 +54,257 @@ def Multiply(A, B, Res):
                 total += A[Outer][Index] * B[Index][Inner]
             Res[Outer][Inner] = total
 
+# -------------------------------
+# Engine for arbitrary sizes
+# -------------------------------
+# Tile edge of multiply_tiled, in elements.
+TILE = 64
+# Matrix sizes of the sweep benchmark.
+SWEEP_SIZES = (20, 50, 100, 200, 500, 1000, 2000)
+
+def random_matrices(n):
+    """Two n x n matrices filled like initialise_benchmark (A first, then B)."""
+    InitSeed()
+    A = [[RandomInteger() for _ in range(n)] for _ in range(n)]
+    B = [[RandomInteger() for _ in range(n)] for _ in range(n)]
+    return A, B
+
+def transpose(B):
+    """Columns of B as lists."""
+    return [list(col) for col in zip(*B)]
+
+def multiply_naive(A, B):
+    """The triple loop of Multiply for any (n x m) @ (m x p)."""
+    inner, cols = len(B), len(B[0]) if B else 0
+    Res = [[0] * cols for _ in A]
+    for Outer in range(len(A)):
+        for Inner in range(cols):
+            total = 0
+            for Index in range(inner):
+                total += A[Outer][Index] * B[Index][Inner]
+            Res[Outer][Inner] = total
+    return Res
+
+def multiply_rows(A, B):
+    """
+    A @ B with B transposed once, so every element is a row-by-row dot
+    product computed by sum(map(operator.mul, ...)) without Python-level
+    indexing or column strides.
+    """
+    mul = operator.mul
+    BT = transpose(B)
+    return [[sum(map(mul, row, col)) for col in BT] for row in A]
+
+def multiply_tiled(A, B, tile=TILE):
+    """
+    A @ B in tiles: the inner dimension is cut into blocks of 'tile', and
+    for each block the row and column slices are reused across a tile x tile
+    block of the result before moving on, which keeps the working set small
+    for large matrices.
+    """
+    mul = operator.mul
+    BT = transpose(B)
+    inner, cols = len(BT[0]) if BT else 0, len(BT)
+    Res = [[0] * cols for _ in A]
+    for k0 in range(0, inner, tile):
+        a_block = [row[k0:k0 + tile] for row in A]
+        b_block = [col[k0:k0 + tile] for col in BT]
+        for i0 in range(0, len(A), tile):
+            for j0 in range(0, cols, tile):
+                b_tile = b_block[j0:j0 + tile]
+                for a, res_row in zip(a_block[i0:i0 + tile], Res[i0:i0 + tile]):
+                    res_row[j0:j0 + tile] = [
+                        total + sum(map(mul, a, b))
+                        for total, b in zip(res_row[j0:j0 + tile], b_tile)]
+    return Res
+
+# -------------------------------
+# Fixed-width C arithmetic (NumPy)
+# -------------------------------
+# The C benchmark multiplies 'long int' values, which wrap on overflow:
+# 64 bits on LP64 hosts, 32 bits on the embedded targets. Python ints never
+# overflow, so the engines above match C only while no sum exceeds the
+# width. NumPy integer matmul accumulates in the array dtype and wraps like
+# C, and since + and * modulo 2**bits do not depend on the order of
+# operations the result is bit-identical to the C loop.
+
+def wrap(value, bits):
+    """Python int reduced to a signed two's-complement integer of 'bits'."""
+    value &= (1 << bits) - 1
+    return value - (1 << bits) if value >> (bits - 1) else value
+
+def multiply_numpy(A, B, dtype="int64"):
+    """A @ B in NumPy with C 'long int' wraparound at the width of dtype."""
+    if np is None:
+        raise RuntimeError("the numpy engines require NumPy")
+    # The inputs (values below MOD_SIZE) fit any width; only sums can wrap.
+    return (np.array(A, dtype=dtype) @ np.array(B, dtype=dtype)).tolist()
+
+# Engines selectable for benchmark_body and the sweep.
+ENGINES = {
+    "naive": multiply_naive,
+    "rows": multiply_rows,
+    "tiled": multiply_tiled,
+    "numpy-int64": lambda A, B: multiply_numpy(A, B, "int64"),
+    "numpy-int32": lambda A, B: multiply_numpy(A, B, "int32"),
+}
+# Integer width of the engines with C overflow semantics (others: unbounded).
+ENGINE_BITS = {"numpy-int64": 64, "numpy-int32": 32}
+
+def default_engines():
+    """Engines usable in this interpreter (the numpy-* ones need NumPy)."""
+    return [name for name in ENGINES if np is not None or name not in ENGINE_BITS]
+
+def sweep_benchmark(sizes=SWEEP_SIZES, engines=None, budget=60.0):
+    """
+    Time of every engine as the matrix size grows. An engine is dropped once
+    its next size is expected (cubic growth) to take longer than 'budget'
+    seconds. Each result is checked against the exact product of the first
+    engine, reduced to the engine's integer width for the numpy-* engines.
+    """
+    engines = engines or default_engines()
+    print(f"{'n':>6}" + "".join(f"{name + ' (s)':>16}" for name in engines) + "  match")
+    last = {}
+    for n in sizes:
+        A, B = random_matrices(n)
+        line = f"{n:>6}"
+        reference = None
+        match = True
+        for name in engines:
+            if name in last and last[name][1] * (n / last[name][0]) ** 3 > budget:
+                line += f"{'-':>16}"
+                continue
+            start = time.perf_counter()
+            result = ENGINES[name](A, B)
+            elapsed = time.perf_counter() - start
+            last[name] = (n, elapsed)
+            line += f"{elapsed:>16.4f}"
+            if reference is None:
+                reference = result
+            bits = ENGINE_BITS.get(name)
+            expected = reference if bits is None else [[wrap(v, bits) for v in row] for row in reference]
+            match = match and result == expected
+        print(line + "  " + ("yes" if match else "NO"))
+
+# -------------------------------
+# Immutable inputs
+# -------------------------------
+class CowMatrix:
+    """
+    Matrix with a copy-on-write reset. 'rows' starts as the shared
+    reference, a tuple of row tuples: the unchanged Multiply reads it at
+    the same cost as a list of lists, and nothing can modify it. The first
+    write (m[i, j] = v) switches 'rows' to a private list-of-lists copy;
+    reset() drops that copy again, so resetting an unmodified matrix (as
+    the benchmark's inputs always are) costs nothing.
+    """
+    __slots__ = ("ref", "rows", "_owned")
+
+    def __init__(self, matrix):
+        self.ref = tuple(tuple(row) for row in matrix)
+        self.rows = self.ref
+        self._owned = False
+
+    def reset(self):
+        if self._owned:
+            self.rows = self.ref
+            self._owned = False
+
+    def __getitem__(self, index):
+        i, j = index
+        return self.rows[i][j]
+
+    def __setitem__(self, index, value):
+        if not self._owned:
+            self.rows = [list(row) for row in self.ref]
+            self._owned = True
+        i, j = index
+        self.rows[i][j] = value
+
+# Copy-on-write inputs over the references, set by initialise_benchmark.
+MatrixA = CowMatrix(ArrayA_ref)
+MatrixB = CowMatrix(ArrayB_ref)
+
+# -------------------------------
+# Parallel row bands over shared memory
+# -------------------------------
+def flatten(matrix):
+    """List of rows as a row-major array('q')."""
+    return array('q', [v for row in matrix for v in row])
+
+# A, B (as columns) and the result of the current multiplication, attached
+# once per worker process by the pool initializer.
+_shared = {}
+
+def _attach_matrices(names, n):
+    """Pool initializer: maps A and the result, and unpacks B's columns once."""
+    for key in ("A", "B", "R"):
+        shm = shared_memory.SharedMemory(name=names[key])
+        _shared[key] = (shm, shm.buf.cast('q'))
+    b = _shared["B"][1].tolist()
+    _shared["cols"] = [b[j::n] for j in range(n)]
+    _shared["n"] = n
+
+def _multiply_band(start, stop):
+    """Worker: rows [start, stop) of A @ B, written straight into the shared result."""
+    mul = operator.mul
+    n, cols = _shared["n"], _shared["cols"]
+    a = _shared["A"][1][start * n:stop * n].tolist()
+    band = array('q', [sum(map(mul, a[i:i + n], col)) for i in range(0, len(a), n) for col in cols])
+    _shared["R"][1][start * n:stop * n] = band
+
+def multiply_parallel(A, B, workers=None, bands_per_worker=4):
+    """
+    A @ B for n x n matrices in a pool of worker processes. A, B and the
+    result are int64 multiprocessing.shared_memory blocks; each task is a
+    band of result rows that the worker writes in place, so only the band
+    bounds are pickled. Returns the result as a list of rows.
+    """
+    n = len(A)
+    workers = workers or os.cpu_count()
+    band = max(1, -(-n // (workers * bands_per_worker)))
+    blocks = {key: shared_memory.SharedMemory(create=True, size=max(8 * n * n, 8)) for key in ("A", "B", "R")}
+    views = {key: shm.buf.cast('q') for key, shm in blocks.items()}
+    try:
+        views["A"][:n * n] = flatten(A)
+        views["B"][:n * n] = flatten(B)
+        # Workers inherit the parent's tracker instead of starting their own.
+        if os.name == "posix":
+            resource_tracker.ensure_running()
+        names = {key: shm.name for key, shm in blocks.items()}
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_attach_matrices, initargs=(names, n)) as pool:
+            for future in [pool.submit(_multiply_band, start, min(start + band, n))
+                           for start in range(0, n, band)]:
+                future.result()
+        result = views["R"][:n * n].tolist()
+        return [result[i:i + n] for i in range(0, n * n, n)]
+    finally:
+        for key, shm in blocks.items():
+            views[key].release()
+            shm.close()
+            shm.unlink()
+
+def parallel_scaling(n=400, max_workers=None):
+    """
+    Time of multiply_parallel on two n x n matrices from 1 to max_workers
+    processes (default: all cores), with speedup and efficiency T1 / (p * Tp)
+    and a check against multiply_rows.
+    """
+    max_workers = max_workers or os.cpu_count()
+    A, B = random_matrices(n)
+    expected = multiply_rows(A, B)
+    print(f"n = {n}")
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}{'efficiency':>12}  match")
+    base = None
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        result = multiply_parallel(A, B, workers)
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f"{workers:>8}{elapsed:>10.3f}{base / elapsed:>10.2f}{base / (workers * elapsed):>12.2f}"
+              f"  {'yes' if result == expected else 'NO'}")
+
 # -------------------------------
 # Test routine
 # -------------------------------
@@ -52,17 +314,66 @@ def Test(A, B, Res):
 # -------------------------------
 # Benchmark body
 # -------------------------------
-def benchmark_body(rpt):
-    for _ in range(rpt):
-        # Reset matrices from reference
-        for i in range(UPPERLIMIT):
-            for j in range(UPPERLIMIT):
-                ArrayA[i][j] = ArrayA_ref[i][j]
-                ArrayB[i][j] = ArrayB_ref[i][j]
+def reset_inputs():
+    # Reset matrices from reference
+    for i in range(UPPERLIMIT):
+        for j in range(UPPERLIMIT):
+            ArrayA[i][j] = ArrayA_ref[i][j]
+            ArrayB[i][j] = ArrayB_ref[i][j]
 
-        Test(ArrayA, ArrayB, ResultArray)
+def benchmark_body(rpt, engine="faithful", immutable=False):
+    """
+    Runs 'rpt' multiplications. By default every repetition first copies the
+    reference matrices element by element, as the C benchmark does; with
+    immutable=True the same Test/Multiply runs on copy-on-write views of
+    the references, whose reset is free, so the loop measures the
+    multiplication only. The immutable mode only supports the faithful
+    engine.
+    """
+    if immutable:
+        if engine != "faithful":
+            raise ValueError(f"immutable mode runs the faithful engine only, not {engine!r}")
+        for _ in range(rpt):
+            MatrixA.reset()
+            MatrixB.reset()
+            Test(MatrixA.rows, MatrixB.rows, ResultArray)
+        return 0
+    for _ in range(rpt):
+        reset_inputs()
+        if engine == "faithful":
+            Test(ArrayA, ArrayB, ResultArray)
+        else:
+            ResultArray[:] = ENGINES[engine](ArrayA, ArrayB)
     return 0
 
+def reset_cost_report(rpt=LOCAL_SCALE_FACTOR * 100):
+    """Splits the time of benchmark_body into input reset and multiplication."""
+    def timed(func):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    def resets():
+        for _ in range(rpt):
+            reset_inputs()
+
+    def multiplies():
+        for _ in range(rpt):
+            Test(ArrayA, ArrayB, ResultArray)
+
+    total = timed(lambda: benchmark_body(rpt))
+    reset = timed(resets)
+    multiply = timed(multiplies)
+    immutable = timed(lambda: benchmark_body(rpt, immutable=True))
+    # Shares of the two parts timed separately (their sum differs from the
+    # combined run by timing noise only).
+    parts = reset + multiply
+    print(f"{rpt} repetitions, same Test/Multiply in every row")
+    print(f"{'benchmark_body':<24}{total:>10.4f} s")
+    print(f"{'  reset only':<24}{reset:>10.4f} s  ({reset / parts * 100:.1f}%)")
+    print(f"{'  multiply only':<24}{multiply:>10.4f} s  ({multiply / parts * 100:.1f}%)")
+    print(f"{'immutable mode':<24}{immutable:>10.4f} s")
+
 def benchmark():
     return benchmark_body(LOCAL_SCALE_FACTOR * 1)
 
@@ -77,6 +388,9 @@ def initialise_benchmark():
     for i in range(UPPERLIMIT):
         for j in range(UPPERLIMIT):
             ArrayB_ref[i][j] = RandomInteger()
+    global MatrixA, MatrixB
+    MatrixA = CowMatrix(ArrayA_ref)
+    MatrixB = CowMatrix(ArrayB_ref)
 
 # -------------------------------
 # Verification using full expected matrix
@@ -111,6 +425,55 @@ def verify_benchmark():
 # Run script
 # -------------------------------
 if __name__ == "__main__":
-    initialise_benchmark()
-    benchmark()
-    print("Verification:", verify_benchmark())
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", choices=["faithful"] + sorted(ENGINES), default="faithful",
+                        help="multiplication engine of the benchmark")
+    parser.add_argument("--sweep", action="store_true",
+                        help="time every engine for matrix sizes 20 to 2000")
+    parser.add_argument("--max-size", type=int, default=SWEEP_SIZES[-1], help="largest size of the sweep")
+    parser.add_argument("--immutable", action="store_true",
+                        help="copy-on-write inputs: time the multiplication without the reset copies")
+    parser.add_argument("--reset-cost", action="store_true",
+                        help="report the reset and multiplication shares of benchmark_body separately")
+    parser.add_argument("--workers", type=int,
+                        help="multiply two --size matrices in this many processes (0 = all cores)")
+    parser.add_argument("--parallel-scaling", action="store_true",
+                        help="time the parallel mode from 1 to all cores")
+    parser.add_argument("--size", type=int, default=400, help="matrix size of the parallel modes")
+    args = parser.parse_args()
+
+    if args.parallel_scaling:
+        parallel_scaling(args.size)
+    elif args.workers is not None:
+        A, B = random_matrices(args.size)
+        start = time.perf_counter()
+        result = multiply_parallel(A, B, args.workers or None)
+        elapsed = time.perf_counter() - start
+        print(f"{args.size} x {args.size}, {args.workers or os.cpu_count()} workers: {elapsed:.3f} s")
+        print("Verification:", result == multiply_rows(A, B))
+    elif args.sweep:
+        sweep_benchmark([n for n in SWEEP_SIZES if n <= args.max_size])
+    elif args.reset_cost:
+        initialise_benchmark()
+        reset_cost_report()
+        print("Verification:", verify_benchmark())
+    elif args.immutable:
+        if args.engine != "faithful":
+            parser.error("--immutable runs the faithful engine only")
+        initialise_benchmark()
+        start = time.perf_counter()
+        benchmark_body(LOCAL_SCALE_FACTOR * 1, immutable=True)
+        elapsed = time.perf_counter() - start
+        print(f"Engine: faithful, immutable inputs (Python int), {LOCAL_SCALE_FACTOR} runs in {elapsed:.4f} s")
+        print("Verification:", verify_benchmark())
+    else:
+        initialise_benchmark()
+        start = time.perf_counter()
+        benchmark_body(LOCAL_SCALE_FACTOR * 1, args.engine)
+        elapsed = time.perf_counter() - start
+        # Name the engine: Python-int engines measure interpreter cost, the
+        # numpy-* ones fixed-width arithmetic in C.
+        bits = ENGINE_BITS.get(args.engine)
+        arithmetic = f"{bits}-bit wraparound" if bits else "Python int"
+        print(f"Engine: {args.engine} ({arithmetic}), {LOCAL_SCALE_FACTOR} runs in {elapsed:.4f} s")
+        print("Verification:", verify_benchmark())
@@ -1,7 +1,13 @@
 # Simple MD5 implementation (Python translation of md5.c from Embench)
 # Translated line by line without simplification
 
+import argparse
+import concurrent.futures
 import ctypes
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
 
 LOCAL_SCALE_FACTOR = 51
 HEAP_SIZE = 2000 + 1016 + 64
@@ -15,6 +21,34 @@ heap = bytearray(HEAP_SIZE)
 def LEFTROTATE(x, c):
     return ((x << c) | (x >> (32 - c))) & 0xFFFFFFFF
 
+# Per-round shift amounts
+MD5_R = [
+    7, 12, 17, 22, 7, 12, 17, 22, 7, 12, 17, 22, 7, 12, 17, 22,
+    5, 9, 14, 20, 5, 9, 14, 20, 5, 9, 14, 20, 5, 9, 14, 20,
+    4, 11, 16, 23, 4, 11, 16, 23, 4, 11, 16, 23, 4, 11, 16, 23,
+    6, 10, 15, 21, 6, 10, 15, 21, 6, 10, 15, 21, 6, 10, 15, 21
+]
+
+# Use sine-based constants
+MD5_K = [
+    0xd76aa478, 0xe8c7b756, 0x242070db, 0xc1bdceee,
+    0xf57c0faf, 0x4787c62a, 0xa8304613, 0xfd469501,
+    0x698098d8, 0x8b44f7af, 0xffff5bb1, 0x895cd7be,
+    0x6b901122, 0xfd987193, 0xa679438e, 0x49b40821,
+    0xf61e2562, 0xc040b340, 0x265e5a51, 0xe9b6c7aa,
+    0xd62f105d, 0x02441453, 0xd8a1e681, 0xe7d3fbc8,
+    0x21e1cde6, 0xc33707d6, 0xf4d50d87, 0x455a14ed,
+    0xa9e3e905, 0xfcefa3f8, 0x676f02d9, 0x8d2a4c8a,
+    0xfffa3942, 0x8771f681, 0x6d9d6122, 0xfde5380c,
+    0xa4beea44, 0x4bdecfa9, 0xf6bb4b60, 0xbebfbc70,
+    0x289b7ec6, 0xeaa127fa, 0xd4ef3085, 0x04881d05,
+    0xd9d4d039, 0xe6db99e5, 0x1fa27cf8, 0xc4ac5665,
+    0xf4292244, 0x432aff97, 0xab9423a7, 0xfc93a039,
+    0x655b59c3, 0x8f0ccc92, 0xffeff47d, 0x85845dd1,
+    0x6fa87e4f, 0xfe2ce6e0, 0xa3014314, 0x4e0811a1,
+    0xf7537e82, 0xbd3af235, 0x2ad7d2bb, 0xeb86d391
+]
+
 # Global hash state
 h0 = 0
 h1 = 0
@@ -25,33 +59,9 @@ h3 = 0
 def md5(initial_msg: bytearray, initial_len: int):
     global h0, h1, h2, h3
 
-    # Per-round shift amounts
-    r = [
-        7, 12, 17, 22, 7, 12, 17, 22, 7, 12, 17, 22, 7, 12, 17, 22,
-        5, 9, 14, 20, 5, 9, 14, 20, 5, 9, 14, 20, 5, 9, 14, 20,
-        4, 11, 16, 23, 4, 11, 16, 23, 4, 11, 16, 23, 4, 11, 16, 23,
-        6, 10, 15, 21, 6, 10, 15, 21, 6, 10, 15, 21, 6, 10, 15, 21
-    ]
-
-    # Use sine-based constants
-    k = [
-        0xd76aa478, 0xe8c7b756, 0x242070db, 0xc1bdceee,
-        0xf57c0faf, 0x4787c62a, 0xa8304613, 0xfd469501,
-        0x698098d8, 0x8b44f7af, 0xffff5bb1, 0x895cd7be,
-        0x6b901122, 0xfd987193, 0xa679438e, 0x49b40821,
-        0xf61e2562, 0xc040b340, 0x265e5a51, 0xe9b6c7aa,
-        0xd62f105d, 0x02441453, 0xd8a1e681, 0xe7d3fbc8,
-        0x21e1cde6, 0xc33707d6, 0xf4d50d87, 0x455a14ed,
-        0xa9e3e905, 0xfcefa3f8, 0x676f02d9, 0x8d2a4c8a,
-        0xfffa3942, 0x8771f681, 0x6d9d6122, 0xfde5380c,
-        0xa4beea44, 0x4bdecfa9, 0xf6bb4b60, 0xbebfbc70,
-        0x289b7ec6, 0xeaa127fa, 0xd4ef3085, 0x04881d05,
-        0xd9d4d039, 0xe6db99e5, 0x1fa27cf8, 0xc4ac5665,
-        0xf4292244, 0x432aff97, 0xab9423a7, 0xfc93a039,
-        0x655b59c3, 0x8f0ccc92, 0xffeff47d, 0x85845dd1,
-        0x6fa87e4f, 0xfe2ce6e0, 0xa3014314, 0x4e0811a1,
-        0xf7537e82, 0xbd3af235, 0x2ad7d2bb, 0xeb86d391
-    ]
+    # Per-round shift amounts and sine-based constants
+    r = MD5_R
+    k = MD5_K
 
     # Initialize hash values
     h0 = 0x67452301
@@ -99,20 +109,398 @@ def md5(initial_msg: bytearray, initial_len: int):
     return (h0, h1, h2, h3)
 
 
+def md5_compress(state, w):
+    """
+    One 64-round MD5 compression of the 16 message words 'w' into the
+    4-word 'state' list (same round logic as md5() above).
+    """
+    a, b, c, d = state
+
+    for i in range(64):
+        if i < 16:
+            f = (b & c) | ((~b) & d)
+            g = i
+        elif i < 32:
+            f = (d & b) | ((~d) & c)
+            g = (5 * i + 1) % 16
+        elif i < 48:
+            f = b ^ c ^ d
+            g = (3 * i + 5) % 16
+        else:
+            f = c ^ (b | (~d))
+            g = (7 * i) % 16
+
+        f = (f + a + MD5_K[i] + w[g]) & 0xFFFFFFFF
+        a, d, c, b = d, c, b, (b + LEFTROTATE(f, MD5_R[i])) & 0xFFFFFFFF
+
+    state[0] = (state[0] + a) & 0xFFFFFFFF
+    state[1] = (state[1] + b) & 0xFFFFFFFF
+    state[2] = (state[2] + c) & 0xFFFFFFFF
+    state[3] = (state[3] + d) & 0xFFFFFFFF
+
+
+def md5_compress_fast(state, w):
+    """
+    Drop-in replacement for md5_compress: the four rounds are unrolled with
+    their boolean function, constant, shift and message word resolved in
+    advance, so there is no branching, no modulo and no LEFTROTATE call.
+    """
+    (x0, x1, x2, x3, x4, x5, x6, x7,
+     x8, x9, x10, x11, x12, x13, x14, x15) = w
+    a, b, c, d = state
+
+    # Round 1: F(b, c, d) = d ^ (b & (c ^ d)), words in order
+    t = (a + (d ^ (b & (c ^ d))) + x0 + 0xd76aa478) & 0xFFFFFFFF
+    a = (b + ((t << 7) | (t >> 25))) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x1 + 0xe8c7b756) & 0xFFFFFFFF
+    d = (a + ((t << 12) | (t >> 20))) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x2 + 0x242070db) & 0xFFFFFFFF
+    c = (d + ((t << 17) | (t >> 15))) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x3 + 0xc1bdceee) & 0xFFFFFFFF
+    b = (c + ((t << 22) | (t >> 10))) & 0xFFFFFFFF
+    t = (a + (d ^ (b & (c ^ d))) + x4 + 0xf57c0faf) & 0xFFFFFFFF
+    a = (b + ((t << 7) | (t >> 25))) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x5 + 0x4787c62a) & 0xFFFFFFFF
+    d = (a + ((t << 12) | (t >> 20))) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x6 + 0xa8304613) & 0xFFFFFFFF
+    c = (d + ((t << 17) | (t >> 15))) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x7 + 0xfd469501) & 0xFFFFFFFF
+    b = (c + ((t << 22) | (t >> 10))) & 0xFFFFFFFF
+    t = (a + (d ^ (b & (c ^ d))) + x8 + 0x698098d8) & 0xFFFFFFFF
+    a = (b + ((t << 7) | (t >> 25))) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x9 + 0x8b44f7af) & 0xFFFFFFFF
+    d = (a + ((t << 12) | (t >> 20))) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x10 + 0xffff5bb1) & 0xFFFFFFFF
+    c = (d + ((t << 17) | (t >> 15))) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x11 + 0x895cd7be) & 0xFFFFFFFF
+    b = (c + ((t << 22) | (t >> 10))) & 0xFFFFFFFF
+    t = (a + (d ^ (b & (c ^ d))) + x12 + 0x6b901122) & 0xFFFFFFFF
+    a = (b + ((t << 7) | (t >> 25))) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x13 + 0xfd987193) & 0xFFFFFFFF
+    d = (a + ((t << 12) | (t >> 20))) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x14 + 0xa679438e) & 0xFFFFFFFF
+    c = (d + ((t << 17) | (t >> 15))) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x15 + 0x49b40821) & 0xFFFFFFFF
+    b = (c + ((t << 22) | (t >> 10))) & 0xFFFFFFFF
+
+    # Round 2: G(b, c, d) = c ^ (d & (b ^ c)), words (5i + 1) mod 16
+    t = (a + (c ^ (d & (b ^ c))) + x1 + 0xf61e2562) & 0xFFFFFFFF
+    a = (b + ((t << 5) | (t >> 27))) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x6 + 0xc040b340) & 0xFFFFFFFF
+    d = (a + ((t << 9) | (t >> 23))) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x11 + 0x265e5a51) & 0xFFFFFFFF
+    c = (d + ((t << 14) | (t >> 18))) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x0 + 0xe9b6c7aa) & 0xFFFFFFFF
+    b = (c + ((t << 20) | (t >> 12))) & 0xFFFFFFFF
+    t = (a + (c ^ (d & (b ^ c))) + x5 + 0xd62f105d) & 0xFFFFFFFF
+    a = (b + ((t << 5) | (t >> 27))) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x10 + 0x02441453) & 0xFFFFFFFF
+    d = (a + ((t << 9) | (t >> 23))) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x15 + 0xd8a1e681) & 0xFFFFFFFF
+    c = (d + ((t << 14) | (t >> 18))) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x4 + 0xe7d3fbc8) & 0xFFFFFFFF
+    b = (c + ((t << 20) | (t >> 12))) & 0xFFFFFFFF
+    t = (a + (c ^ (d & (b ^ c))) + x9 + 0x21e1cde6) & 0xFFFFFFFF
+    a = (b + ((t << 5) | (t >> 27))) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x14 + 0xc33707d6) & 0xFFFFFFFF
+    d = (a + ((t << 9) | (t >> 23))) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x3 + 0xf4d50d87) & 0xFFFFFFFF
+    c = (d + ((t << 14) | (t >> 18))) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x8 + 0x455a14ed) & 0xFFFFFFFF
+    b = (c + ((t << 20) | (t >> 12))) & 0xFFFFFFFF
+    t = (a + (c ^ (d & (b ^ c))) + x13 + 0xa9e3e905) & 0xFFFFFFFF
+    a = (b + ((t << 5) | (t >> 27))) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x2 + 0xfcefa3f8) & 0xFFFFFFFF
+    d = (a + ((t << 9) | (t >> 23))) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x7 + 0x676f02d9) & 0xFFFFFFFF
+    c = (d + ((t << 14) | (t >> 18))) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x12 + 0x8d2a4c8a) & 0xFFFFFFFF
+    b = (c + ((t << 20) | (t >> 12))) & 0xFFFFFFFF
+
+    # Round 3: H(b, c, d) = b ^ c ^ d, words (3i + 5) mod 16
+    t = (a + (b ^ c ^ d) + x5 + 0xfffa3942) & 0xFFFFFFFF
+    a = (b + ((t << 4) | (t >> 28))) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x8 + 0x8771f681) & 0xFFFFFFFF
+    d = (a + ((t << 11) | (t >> 21))) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x11 + 0x6d9d6122) & 0xFFFFFFFF
+    c = (d + ((t << 16) | (t >> 16))) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x14 + 0xfde5380c) & 0xFFFFFFFF
+    b = (c + ((t << 23) | (t >> 9))) & 0xFFFFFFFF
+    t = (a + (b ^ c ^ d) + x1 + 0xa4beea44) & 0xFFFFFFFF
+    a = (b + ((t << 4) | (t >> 28))) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x4 + 0x4bdecfa9) & 0xFFFFFFFF
+    d = (a + ((t << 11) | (t >> 21))) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x7 + 0xf6bb4b60) & 0xFFFFFFFF
+    c = (d + ((t << 16) | (t >> 16))) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x10 + 0xbebfbc70) & 0xFFFFFFFF
+    b = (c + ((t << 23) | (t >> 9))) & 0xFFFFFFFF
+    t = (a + (b ^ c ^ d) + x13 + 0x289b7ec6) & 0xFFFFFFFF
+    a = (b + ((t << 4) | (t >> 28))) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x0 + 0xeaa127fa) & 0xFFFFFFFF
+    d = (a + ((t << 11) | (t >> 21))) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x3 + 0xd4ef3085) & 0xFFFFFFFF
+    c = (d + ((t << 16) | (t >> 16))) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x6 + 0x04881d05) & 0xFFFFFFFF
+    b = (c + ((t << 23) | (t >> 9))) & 0xFFFFFFFF
+    t = (a + (b ^ c ^ d) + x9 + 0xd9d4d039) & 0xFFFFFFFF
+    a = (b + ((t << 4) | (t >> 28))) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x12 + 0xe6db99e5) & 0xFFFFFFFF
+    d = (a + ((t << 11) | (t >> 21))) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x15 + 0x1fa27cf8) & 0xFFFFFFFF
+    c = (d + ((t << 16) | (t >> 16))) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x2 + 0xc4ac5665) & 0xFFFFFFFF
+    b = (c + ((t << 23) | (t >> 9))) & 0xFFFFFFFF
+
+    # Round 4: I(b, c, d) = c ^ (b | ~d), words 7i mod 16
+    t = (a + (c ^ (b | ~d)) + x0 + 0xf4292244) & 0xFFFFFFFF
+    a = (b + ((t << 6) | (t >> 26))) & 0xFFFFFFFF
+    t = (d + (b ^ (a | ~c)) + x7 + 0x432aff97) & 0xFFFFFFFF
+    d = (a + ((t << 10) | (t >> 22))) & 0xFFFFFFFF
+    t = (c + (a ^ (d | ~b)) + x14 + 0xab9423a7) & 0xFFFFFFFF
+    c = (d + ((t << 15) | (t >> 17))) & 0xFFFFFFFF
+    t = (b + (d ^ (c | ~a)) + x5 + 0xfc93a039) & 0xFFFFFFFF
+    b = (c + ((t << 21) | (t >> 11))) & 0xFFFFFFFF
+    t = (a + (c ^ (b | ~d)) + x12 + 0x655b59c3) & 0xFFFFFFFF
+    a = (b + ((t << 6) | (t >> 26))) & 0xFFFFFFFF
+    t = (d + (b ^ (a | ~c)) + x3 + 0x8f0ccc92) & 0xFFFFFFFF
+    d = (a + ((t << 10) | (t >> 22))) & 0xFFFFFFFF
+    t = (c + (a ^ (d | ~b)) + x10 + 0xffeff47d) & 0xFFFFFFFF
+    c = (d + ((t << 15) | (t >> 17))) & 0xFFFFFFFF
+    t = (b + (d ^ (c | ~a)) + x1 + 0x85845dd1) & 0xFFFFFFFF
+    b = (c + ((t << 21) | (t >> 11))) & 0xFFFFFFFF
+    t = (a + (c ^ (b | ~d)) + x8 + 0x6fa87e4f) & 0xFFFFFFFF
+    a = (b + ((t << 6) | (t >> 26))) & 0xFFFFFFFF
+    t = (d + (b ^ (a | ~c)) + x15 + 0xfe2ce6e0) & 0xFFFFFFFF
+    d = (a + ((t << 10) | (t >> 22))) & 0xFFFFFFFF
+    t = (c + (a ^ (d | ~b)) + x6 + 0xa3014314) & 0xFFFFFFFF
+    c = (d + ((t << 15) | (t >> 17))) & 0xFFFFFFFF
+    t = (b + (d ^ (c | ~a)) + x13 + 0x4e0811a1) & 0xFFFFFFFF
+    b = (c + ((t << 21) | (t >> 11))) & 0xFFFFFFFF
+    t = (a + (c ^ (b | ~d)) + x4 + 0xf7537e82) & 0xFFFFFFFF
+    a = (b + ((t << 6) | (t >> 26))) & 0xFFFFFFFF
+    t = (d + (b ^ (a | ~c)) + x11 + 0xbd3af235) & 0xFFFFFFFF
+    d = (a + ((t << 10) | (t >> 22))) & 0xFFFFFFFF
+    t = (c + (a ^ (d | ~b)) + x2 + 0x2ad7d2bb) & 0xFFFFFFFF
+    c = (d + ((t << 15) | (t >> 17))) & 0xFFFFFFFF
+    t = (b + (d ^ (c | ~a)) + x9 + 0xeb86d391) & 0xFFFFFFFF
+    b = (c + ((t << 21) | (t >> 11))) & 0xFFFFFFFF
+
+    state[0] = (state[0] + a) & 0xFFFFFFFF
+    state[1] = (state[1] + b) & 0xFFFFFFFF
+    state[2] = (state[2] + c) & 0xFFFFFFFF
+    state[3] = (state[3] + d) & 0xFFFFFFFF
+
+
+# Compression functions selectable for Md5Ctx
+COMPRESS = {
+    "faithful": md5_compress,
+    "fast": md5_compress_fast,
+}
+
+
+MD5_BLOCK_SIZE = 64
+MD5_INIT = (0x67452301, 0xefcdab89, 0x98badcfe, 0x10325476)
+# Chunk size used by hash_file
+FILE_CHUNK_SIZE = 1 << 20
+
+_unpack_block = struct.Struct("<16I").unpack_from
+
+
+class Md5Ctx:
+    """
+    Incremental MD5 with its own state, so several hashes can run at once.
+    update() walks the input 64 bytes at a time through a memoryview and
+    only copies the bytes of a trailing partial block. 'compress' selects
+    the compression function ("faithful" or "fast", see COMPRESS).
+    """
+
+    def __init__(self, compress="faithful"):
+        self.compress = COMPRESS[compress]
+        self.state = list(MD5_INIT)
+        self.block = bytearray(MD5_BLOCK_SIZE)
+        self.index = 0
+        self.total_length = 0
+
+    def init(self):
+        """Resets the context to the MD5 initial values."""
+        self.state = list(MD5_INIT)
+        self.index = 0
+        self.total_length = 0
+
+    def update(self, data):
+        """Hashes more data (bytes, bytearray, memoryview, ...)."""
+        view = memoryview(data).cast("B")
+        data_len = len(view)
+        self.total_length += data_len
+        data_pos = 0
+
+        if self.index > 0:
+            left = MD5_BLOCK_SIZE - self.index
+            if data_len < left:
+                self.block[self.index:self.index + data_len] = view
+                self.index += data_len
+                return
+            self.block[self.index:] = view[:left]
+            self.compress(self.state, _unpack_block(self.block))
+            data_pos = left
+
+        compress = self.compress
+        state = self.state
+        while data_pos + MD5_BLOCK_SIZE <= data_len:
+            compress(state, _unpack_block(view, data_pos))
+            data_pos += MD5_BLOCK_SIZE
+
+        remaining = data_len - data_pos
+        self.block[:remaining] = view[data_pos:]
+        self.index = remaining
+
+    def words(self):
+        """Finalizes the hash and returns the state words (h0, h1, h2, h3)."""
+        # 0x80, zeros up to 56 mod 64, then the bit length (little-endian).
+        bit_count = (self.total_length * 8) & 0xFFFFFFFFFFFFFFFF
+        pad_len = (55 - self.index) % MD5_BLOCK_SIZE
+        self.update(b"\x80" + bytes(pad_len) + bit_count.to_bytes(8, "little"))
+        result = tuple(self.state)
+        # Reset context for any future use
+        self.init()
+        return result
+
+    def digest(self):
+        """Finalizes the hash and returns the 16-byte digest."""
+        return struct.pack("<4I", *self.words())
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+
+def hash_file(path, chunk_size=FILE_CHUNK_SIZE, compress="fast"):
+    """MD5 digest of a file, read in large chunks into one reused buffer."""
+    ctx = Md5Ctx(compress)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            ctx.update(view[:n])
+    return ctx.digest()
+
+
+# -------------------------------
+# Multi-buffer hashing in a process pool
+# -------------------------------
+
+def make_pool(workers=None):
+    """
+    Process pool for hash_many. The resource tracker is started first so
+    the workers share it with this process: a worker attaching to a shared
+    block then does not get a tracker of its own that would report the
+    block as leaked (and try to unlink it) when the worker exits. The
+    tracker only exists on POSIX; Windows frees shared memory by itself.
+    """
+    if os.name == "posix":
+        resource_tracker.ensure_running()
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+
+
+def _hash_shared(shm_name, offset, length):
+    """Worker: MD5 of one slice of a shared memory block, read in place."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        ctx = Md5Ctx("fast")
+        # Released even if update raises, so close() cannot mask the error.
+        with shm.buf[offset:offset + length] as view:
+            ctx.update(view)
+        return ctx.digest()
+    finally:
+        shm.close()
+
+
+def hash_many(items, workers=None, pool=None):
+    """
+    MD5 digests of many independent buffers and/or file paths, computed in
+    a pool of worker processes and returned in input order. Buffers are
+    copied once into a single shared memory block that the workers read
+    in place, so only (name, offset, length) is pickled per buffer; paths
+    are hashed by the workers with hash_file. An existing pool (see
+    make_pool) can be passed to avoid starting one per call.
+    """
+    items = list(items)
+    buffers = [item for item in items if not isinstance(item, (str, os.PathLike))]
+    total = sum(len(memoryview(b).cast("B")) for b in buffers)
+    shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+    own_pool = pool is None
+    if own_pool:
+        pool = make_pool(workers)
+    try:
+        futures = []
+        offset = 0
+        for item in items:
+            if isinstance(item, (str, os.PathLike)):
+                futures.append(pool.submit(hash_file, os.fspath(item)))
+                continue
+            data = memoryview(item).cast("B")
+            shm.buf[offset:offset + len(data)] = data
+            futures.append(pool.submit(_hash_shared, shm.name, offset, len(data)))
+            offset += len(data)
+        return [f.result() for f in futures]
+    finally:
+        if own_pool:
+            pool.shutdown()
+        shm.close()
+        shm.unlink()
+
+
+def scaling_benchmark(n_buffers=64, size=1 << 18, max_workers=None):
+    """
+    Aggregate MB/s of hash_many over n_buffers buffers of 'size' bytes as
+    the worker count goes from 1 to max_workers (default: all cores).
+    """
+    max_workers = max_workers or os.cpu_count()
+    buffers = [bytes((i + j) & 0xFF for j in range(256)) * (size // 256) for i in range(n_buffers)]
+    expected = None
+    megabytes = n_buffers * (size // 256) * 256 / 1e6
+    print(f"{'workers':>8}{'time (s)':>12}{'MB/s':>10}{'speedup':>10}")
+    base = None
+    for workers in range(1, max_workers + 1):
+        with make_pool(workers) as pool:
+            # Start the workers before timing.
+            list(pool.map(int, range(workers)))
+            start = time.perf_counter()
+            digests = hash_many(buffers, pool=pool)
+            elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = digests
+        assert digests == expected
+        base = base or elapsed
+        print(f"{workers:>8}{elapsed:>12.3f}{megabytes / elapsed:>10.2f}{base / elapsed:>10.2f}")
+
+
 def initialise_benchmark():
     pass
 
 
-def benchmark_body(rpt, length):
+def benchmark_body(rpt, length=MSG_SIZE, engine="md5"):
+    """
+    engine="md5" runs the line-by-line md5(); engine="ctx" hashes the same
+    message through Md5Ctx, and engine="fast" through Md5Ctx with the
+    unrolled compression function.
+    """
     global h0, h1, h2, h3
     result = 0
+    ctx = Md5Ctx("fast" if engine == "fast" else "faithful")
 
     for _ in range(rpt):
         msg = bytearray(length)
         for i in range(length):
             msg[i] = i & 0xFF
 
-        h0, h1, h2, h3 = md5(msg, length)
+        if engine != "md5":
+            ctx.update(msg)
+            h0, h1, h2, h3 = ctx.words()
+        else:
+            h0, h1, h2, h3 = md5(msg, length)
         result = h0 ^ h1 ^ h2 ^ h3
 
     return result
@@ -131,6 +519,24 @@ def verify_benchmark(r):
 
 
 if __name__ == "__main__":
-    r = benchmark()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", choices=("md5", "ctx", "fast"), default="md5",
+                        help="md5 = line-by-line port, ctx = streaming Md5Ctx, "
+                             "fast = Md5Ctx with the unrolled compression")
+    parser.add_argument("--file", nargs="+",
+                        help="print the MD5 of files (hashed in parallel) instead of running the benchmark")
+    parser.add_argument("--scaling", action="store_true",
+                        help="measure MB/s of hash_many from 1 to all cores")
+    parser.add_argument("--buffers", type=int, default=64, help="buffers for --scaling")
+    parser.add_argument("--size", type=int, default=1 << 18, help="buffer size in bytes for --scaling")
+    args = parser.parse_args()
+    if args.file:
+        for path, digest in zip(args.file, hash_many(args.file)):
+            print(digest.hex(), path)
+        raise SystemExit
+    if args.scaling:
+        scaling_benchmark(args.buffers, args.size)
+        raise SystemExit
+    r = benchmark_body(LOCAL_SCALE_FACTOR * 1, MSG_SIZE, args.engine)
     print("Result:", hex(r))
     print("Verification:", verify_benchmark(r))
@@ -1,5 +1,8 @@
 import copy
 
+LOCAL_SCALE_FACTOR = 555
+CPU_MHZ = 1
+
 # Reference matrices
 a_ref = [
     [3.0, -6.0, 7.0],
@@ -143,8 +146,6 @@ def benchmark_body(rpt):
 
 # Main benchmark function
 def benchmark():
-    LOCAL_SCALE_FACTOR = 555
-    CPU_MHZ = 1
     return benchmark_body(LOCAL_SCALE_FACTOR * CPU_MHZ)
 
 if __name__ == "__main__":
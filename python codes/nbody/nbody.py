@@ -1,6 +1,19 @@
 # BEEBS nbody benchmark - Python conversion
 # Based on the original C version (GPL-3.0-or-later, BSD portions)
+import argparse
+import concurrent.futures
+import gc
 import math
+import os
+import time
+import tracemalloc
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only needed by NBodySystem
+    np = None
 
 # Constants
 PI = 3.141592653589793
@@ -9,8 +22,8 @@ DAYS_PER_YEAR = 365.24
 
 class Body:
     def __init__(self, x, v, mass):
-        self.x = x[:]  # position vector
-        self.v = v[:]  # velocity vector
+        self.x = list(x)  # position vector (copied from any sequence)
+        self.v = list(v)  # velocity vector
         self.mass = mass
 
 # Solar system bodies (Sun + 4 giant planets)
@@ -87,6 +100,605 @@ def benchmark_body(rpt=1):
     expected = -16.907516382852478
     return abs(tot_e - expected) < 1e-9
 
+# ---------------------------------------------------------------
+# Compact array-backed bodies
+# ---------------------------------------------------------------
+
+class BodyView:
+    """
+    One body of a BodySystem, usable wherever a Body is expected: x and v
+    are 3-element memoryviews into the system's arrays (b.v[0] -= ... writes
+    through), mass reads and writes the mass array.
+    """
+    __slots__ = ("_system", "_index")
+
+    def __init__(self, system, index):
+        self._system = system
+        self._index = index
+
+    @property
+    def x(self):
+        i = 3 * self._index
+        return self._system._x[i:i + 3]
+
+    @property
+    def v(self):
+        i = 3 * self._index
+        return self._system._v[i:i + 3]
+
+    @property
+    def mass(self):
+        return self._system.mass[self._index]
+
+    @mass.setter
+    def mass(self, value):
+        self._system.mass[self._index] = value
+
+
+class BodySystem:
+    """
+    Bodies stored as three flat array('d') buffers (x and v interleaved as
+    x0 y0 z0 x1 ..., one mass per body): 56 bytes per body instead of the
+    several hundred of a Body with its dict, two lists and six floats.
+    Indexing returns a BodyView, so offset_momentum() and bodies_energy()
+    accept a BodySystem unchanged; the methods of the same name work on the
+    arrays directly and avoid the per-body attribute lookups.
+    """
+    __slots__ = ("x", "v", "mass", "_x", "_v")
+
+    def __init__(self, x, v, mass):
+        self.x = array('d', x)
+        self.v = array('d', v)
+        self.mass = array('d', mass)
+        if len(self.x) != 3 * len(self.mass) or len(self.v) != 3 * len(self.mass):
+            raise ValueError("x and v need three components per body")
+        # Views for BodyView; the arrays keep a fixed length from here on.
+        self._x = memoryview(self.x)
+        self._v = memoryview(self.v)
+
+    @classmethod
+    def from_bodies(cls, bodies):
+        return cls([c for b in bodies for c in b.x],
+                   [c for b in bodies for c in b.v],
+                   [b.mass for b in bodies])
+
+    @classmethod
+    def zeros(cls, n):
+        return cls(array('d', bytes(24 * n)), array('d', bytes(24 * n)), array('d', bytes(8 * n)))
+
+    def __len__(self):
+        return len(self.mass)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("body index out of range")
+        return BodyView(self, index)
+
+    def __iter__(self):
+        return (BodyView(self, i) for i in range(len(self)))
+
+    def offset_momentum(self):
+        """Same as offset_momentum(bodies), on the flat arrays."""
+        v, mass = self.v, self.mass
+        px = py = pz = 0.0
+        for vx, vy, vz, m in zip(v[0::3], v[1::3], v[2::3], mass):
+            px += vx * m
+            py += vy * m
+            pz += vz * m
+        v[0] -= px / SOLAR_MASS
+        v[1] -= py / SOLAR_MASS
+        v[2] -= pz / SOLAR_MASS
+
+    def energy(self):
+        """Same as bodies_energy(bodies), on the flat arrays."""
+        x, v, mass = self.x, self.v, self.mass
+        sqrt = math.sqrt
+        e = 0.0
+        for vx, vy, vz, m in zip(v[0::3], v[1::3], v[2::3], mass):
+            e += m * (vx * vx + vy * vy + vz * vz) / 2.0
+        # Component-wise strided copies keep the inner loop free of index math.
+        xs, ys, zs = x[0::3], x[1::3], x[2::3]
+        for i, (xi, yi, zi, m) in enumerate(zip(xs, ys, zs, mass), 1):
+            for xj, yj, zj, mj in zip(xs[i:], ys[i:], zs[i:], mass[i:]):
+                dx = xi - xj
+                dy = yi - yj
+                dz = zi - zj
+                e -= (m * mj) / sqrt(dx * dx + dy * dy + dz * dz)
+        return e
+
+
+def verify_compact():
+    """The five-body energy check of benchmark_body, through BodySystem."""
+    system = BodySystem.from_bodies(solar_bodies)
+    # The generic functions must accept the views...
+    offset_momentum(system)
+    generic = bodies_energy(system)
+    # ...and agree with the array methods.
+    system = BodySystem.from_bodies(solar_bodies)
+    system.offset_momentum()
+    tot_e = 0.0
+    for _ in range(100):
+        tot_e += system.energy()
+    return generic == system.energy() and abs(tot_e - (-16.907516382852478)) < 1e-9
+
+
+def _traced_bytes(build):
+    """Bytes still allocated after build(), and the built object."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, obj
+
+
+def memory_benchmark(n=1_000_000):
+    """Bytes per body of a list of Body objects versus a BodySystem."""
+    template = solar_bodies[1]
+    print(f"{'layout':<16}{'bodies':>10}{'MB':>10}{'bytes/body':>12}")
+    for name, build in (
+            # Fresh floats per body, as real bodies own their coordinates.
+            ("list[Body]", lambda: [Body([c + 0.0 for c in template.x], [c + 0.0 for c in template.v],
+                                         template.mass + 0.0) for _ in range(n)]),
+            ("BodySystem", lambda: BodySystem(template.x * n, template.v * n, [template.mass] * n))):
+        size, obj = _traced_bytes(build)
+        del obj
+        print(f"{name:<16}{n:>10}{size / 1e6:>10.1f}{size / n:>12.1f}")
+
+
+# ---------------------------------------------------------------
+# Structure-of-arrays integrator (NumPy)
+# ---------------------------------------------------------------
+
+# Rows of bodies handled per vectorized pair block; bounds the temporary
+# (rows, N, 3) arrays to a few MB whatever N is.
+PAIR_BLOCK_ELEMENTS = 1 << 18
+
+def _row_blocks(n, start=0, stop=None):
+    """Splits rows [start, stop) into blocks of at most PAIR_BLOCK_ELEMENTS pairs."""
+    stop = n if stop is None else stop
+    rows = max(1, PAIR_BLOCK_ELEMENTS // max(n, 1))
+    for first in range(start, stop, rows):
+        yield first, min(first + rows, stop)
+
+
+def _potential_rows(pos, mass, start, stop):
+    """Sum of -m_i m_j / r_ij over the pairs i < j with i in [start, stop)."""
+    columns = np.arange(len(mass))
+    e = 0.0
+    for first, last in _row_blocks(len(mass), start, stop):
+        d = pos[first:last, None, :] - pos[None, :, :]
+        dist = np.sqrt((d * d).sum(axis=2))
+        upper = columns[None, :] > np.arange(first, last)[:, None]
+        e -= float((mass[first:last, None] * mass[None, :] / np.where(upper, dist, np.inf)).sum())
+    return e
+
+
+def _accel_rows(pos, mass, start, stop, acc):
+    """Writes the exact acceleration of bodies [start, stop) into acc."""
+    for first, last in _row_blocks(len(mass), start, stop):
+        d = pos[None, :, :] - pos[first:last, None, :]
+        dist2 = np.einsum('ijk,ijk->ij', d, d)
+        # Self-interaction: infinite distance gives a zero contribution.
+        dist2[np.arange(last - first), np.arange(first, last)] = np.inf
+        weight = mass[None, :] / (dist2 * np.sqrt(dist2))
+        # sum_j w_ij (p_j - p_i) == (W @ P)_i - (sum_j w_ij) p_i
+        acc[first:last] = weight @ pos - weight.sum(axis=1)[:, None] * pos[first:last]
+
+
+# Reference energy of the five-body system after offset_momentum,
+# accumulated 100 times (see benchmark_body).
+EXPECTED_ENERGY = -16.907516382852478
+
+
+class NBodySystem:
+    """
+    N bodies stored as contiguous NumPy arrays: pos and vel are (N, 3),
+    mass is (N,). Forces and energies are computed pairwise with vectorized
+    row blocks instead of a Python loop over pairs.
+    """
+
+    def __init__(self, pos, vel, mass):
+        if np is None:
+            raise ImportError("NBodySystem needs NumPy")
+        self.pos = np.ascontiguousarray(pos, dtype=np.float64)
+        self.vel = np.ascontiguousarray(vel, dtype=np.float64)
+        self.mass = np.ascontiguousarray(mass, dtype=np.float64)
+
+    @classmethod
+    def from_bodies(cls, bodies):
+        """Copies a list of Body objects (e.g. solar_bodies)."""
+        return cls([b.x for b in bodies], [b.v for b in bodies], [b.mass for b in bodies])
+
+    @classmethod
+    def random(cls, n, seed=0):
+        """
+        n bodies with a central solar mass and the rest spread over a disc
+        of orbits between 1 and 30 units, on roughly circular velocities.
+        """
+        rng = np.random.default_rng(seed)
+        radius = rng.uniform(1.0, 30.0, n)
+        angle = rng.uniform(0.0, 2 * PI, n)
+        pos = np.stack((radius * np.cos(angle), radius * np.sin(angle),
+                        rng.normal(0.0, 0.01, n) * radius), axis=1)
+        speed = np.sqrt(SOLAR_MASS / radius)
+        vel = np.stack((-speed * np.sin(angle), speed * np.cos(angle), np.zeros(n)), axis=1)
+        mass = rng.uniform(1e-9, 1e-7, n) * SOLAR_MASS
+        pos[0] = vel[0] = 0.0
+        mass[0] = SOLAR_MASS
+        return cls(pos, vel, mass)
+
+    def __len__(self):
+        return len(self.mass)
+
+    def offset_momentum(self):
+        """Same as offset_momentum(): zero the total momentum via body 0."""
+        self.vel[0] -= (self.vel * self.mass[:, None]).sum(axis=0) / SOLAR_MASS
+
+    def kinetic_energy(self):
+        return 0.5 * float(np.dot(self.mass, (self.vel * self.vel).sum(axis=1)))
+
+    def potential_energy(self):
+        """Sum of -m_i m_j / r_ij over all pairs i < j."""
+        return _potential_rows(self.pos, self.mass, 0, len(self))
+
+    def energy(self, theta=None):
+        """
+        Total energy, the vectorized equivalent of bodies_energy().
+        With an opening angle 'theta' the potential energy is approximated
+        with a Barnes-Hut octree instead of summed over all pairs.
+        """
+        if theta is not None:
+            _, phi = Octree(self.pos, self.mass).field(theta)
+            return self.kinetic_energy() + 0.5 * float(np.dot(self.mass, phi))
+        return self.kinetic_energy() + self.potential_energy()
+
+    def accelerations(self, theta=None):
+        """
+        (N, 3) gravitational acceleration of every body: exact pairwise sum,
+        or Barnes-Hut approximation when an opening angle 'theta' is given.
+        """
+        if theta is not None:
+            acc, _ = Octree(self.pos, self.mass).field(theta)
+            return acc
+        acc = np.empty_like(self.pos)
+        _accel_rows(self.pos, self.mass, 0, len(self), acc)
+        return acc
+
+    def advance(self, dt, steps=1, theta=None):
+        """Symplectic Euler steps: update all velocities, then all positions."""
+        for _ in range(steps):
+            self.vel += dt * self.accelerations(theta)
+            self.pos += dt * self.vel
+
+
+# ---------------------------------------------------------------
+# Barnes-Hut octree
+# ---------------------------------------------------------------
+
+# Maximum number of bodies in a leaf; leaves are summed exactly.
+LEAF_SIZE = 16
+# Default opening angle (cell size / distance) below which a cell is
+# treated as a single point mass at its centre of mass.
+THETA = 0.5
+
+# Offsets of the 8 child octants, indexed by x | y << 1 | z << 2.
+_OCTANT_SIGNS = [[1 if o & bit else -1 for bit in (1, 2, 4)] for o in range(8)]
+
+
+class OctreeNode:
+    """A cube of the octree: total mass, centre of mass, geometric centre and
+    edge length, and its children (or, for a leaf, the indices of its bodies)."""
+
+    __slots__ = ("mass", "com", "center", "size", "children", "bodies")
+
+    def __init__(self, mass, com, center, size, children, bodies):
+        self.mass = mass
+        self.com = com
+        self.center = center
+        self.size = size
+        self.children = children
+        self.bodies = bodies
+
+
+class Octree:
+    """
+    Barnes-Hut octree over (N, 3) positions. The tree is built and walked
+    with NumPy index arrays: every node is visited once with all the bodies
+    that still need it, so the Python-level work is per node, not per body.
+    """
+
+    def __init__(self, pos, mass, leaf_size=LEAF_SIZE):
+        self.pos = pos
+        self.mass = mass
+        self.leaf_size = leaf_size
+        lo = pos.min(axis=0)
+        hi = pos.max(axis=0)
+        half = max(float((hi - lo).max()) / 2, 1e-12) * (1 + 1e-9)
+        self._min_half = half * 1e-12
+        self.root = self._build(np.arange(len(mass)), (lo + hi) / 2, half)
+
+    def _build(self, idx, center, half):
+        m = self.mass[idx]
+        total = float(m.sum())
+        com = (m @ self.pos[idx]) / total if total > 0 else center
+        if len(idx) <= self.leaf_size or half < self._min_half:
+            return OctreeNode(total, com, center, 2 * half, None, idx)
+        octant = (self.pos[idx] > center) @ np.array([1, 2, 4])
+        order = np.argsort(octant, kind="stable")
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(octant, minlength=8))))
+        children = []
+        for o in range(8):
+            members = idx[order[bounds[o]:bounds[o + 1]]]
+            if len(members):
+                child_center = center + np.multiply(_OCTANT_SIGNS[o], half / 2)
+                children.append(self._build(members, child_center, half / 2))
+        return OctreeNode(total, com, center, 2 * half, children, None)
+
+    def field(self, theta=THETA):
+        """
+        Acceleration (N, 3) and potential (N,) at every body. A cell is
+        accepted as one point mass when size / distance < theta and the body
+        lies outside the cell; otherwise the bodies descend to its children.
+        (For theta above 1/sqrt(3) the distance test alone can accept the
+        cell holding the body, counting its own mass.) theta=0 gives the
+        exact sums.
+        """
+        pos, mass = self.pos, self.mass
+        acc = np.zeros_like(pos)
+        phi = np.zeros(len(mass))
+        theta2 = theta * theta
+        stack = [(self.root, np.arange(len(mass)))]
+        while stack:
+            node, idx = stack.pop()
+            if node.children is None:
+                # Leaf: exact sum over its bodies, skipping self-interaction.
+                src = node.bodies
+                d = pos[None, src, :] - pos[idx, None, :]
+                dist2 = np.einsum('ijk,ijk->ij', d, d)
+                dist2[idx[:, None] == src[None, :]] = np.inf
+                inv = 1.0 / np.sqrt(dist2)
+                acc[idx] += np.einsum('ij,ijk->ik', mass[src] * inv ** 3, d)
+                phi[idx] -= inv @ mass[src]
+                continue
+            d = node.com - pos[idx]
+            dist2 = np.einsum('ij,ij->i', d, d)
+            outside = np.abs(pos[idx] - node.center).max(axis=1) > node.size / 2
+            far = outside & (node.size * node.size < theta2 * dist2)
+            if far.any():
+                inv = 1.0 / np.sqrt(dist2[far])
+                hit = idx[far]
+                acc[hit] += (node.mass * inv ** 3)[:, None] * d[far]
+                phi[hit] -= node.mass * inv
+                idx = idx[~far]
+            if len(idx):
+                stack.extend((child, idx) for child in node.children)
+        return acc, phi
+
+
+def barnes_hut_benchmark(sizes=(1000, 4000, 16000, 64000, 100000), theta=THETA, exact_limit=16000):
+    """
+    Time per step of the exact and Barnes-Hut accelerations as N grows, and
+    the relative error of the Barnes-Hut energy against the exact energy
+    (the exact path is skipped above 'exact_limit' bodies).
+    """
+    print(f"theta = {theta}")
+    print(f"{'N':>8}{'exact ms/step':>15}{'BH ms/step':>12}{'energy rel. error':>19}")
+    for n in sizes:
+        system = NBodySystem.random(n)
+        start = time.perf_counter()
+        system.accelerations(theta)
+        bh_time = time.perf_counter() - start
+        bh_energy = system.energy(theta)
+        if n <= exact_limit:
+            start = time.perf_counter()
+            system.accelerations()
+            exact_time = f"{(time.perf_counter() - start) * 1e3:.1f}"
+            exact_energy = system.energy()
+            error = f"{abs((bh_energy - exact_energy) / exact_energy):.3e}"
+        else:
+            exact_time = error = "-"
+        print(f"{n:>8}{exact_time:>15}{bh_time * 1e3:>12.1f}{error:>19}")
+
+    # The five-body case against the original bodies_energy().
+    bodies = [Body(b.x, b.v, b.mass) for b in solar_bodies]
+    offset_momentum(bodies)
+    exact = bodies_energy(bodies)
+    approx = NBodySystem.from_bodies(bodies).energy(theta)
+    print(f"solar_bodies: bodies_energy {exact:.15f}, Barnes-Hut {approx:.15f}, "
+          f"rel. error {abs((approx - exact) / exact):.3e}")
+
+
+# ---------------------------------------------------------------
+# Multi-core pairwise interactions over shared memory
+# ---------------------------------------------------------------
+
+# Bodies per row tile of ParallelPairs. Fixed, not derived from the worker
+# count, so every pool size sums the same tiles in the same order.
+TILE_ROWS = 64
+
+# Arrays of the system being computed, attached once per worker process.
+_shared = {}
+
+
+def _attach_worker(names, n):
+    """Pool initializer: maps the shared pos, mass and acc arrays."""
+    for key, shape in (("pos", (n, 3)), ("mass", (n,)), ("acc", (n, 3))):
+        shm = shared_memory.SharedMemory(name=names[key])
+        _shared[key] = (shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf))
+
+
+def _tile_accel(start, stop):
+    """Worker: accelerations of the body tile [start, stop) into shared acc."""
+    _accel_rows(_shared["pos"][1], _shared["mass"][1], start, stop, _shared["acc"][1])
+
+
+def _tile_potential(start, stop):
+    """Worker: potential energy of the pairs whose first body is in [start, stop)."""
+    return _potential_rows(_shared["pos"][1], _shared["mass"][1], start, stop)
+
+
+class ParallelPairs:
+    """
+    Computes the exact pairwise interactions of an NBodySystem in a pool of
+    worker processes. Positions, masses and the acceleration output live in
+    multiprocessing.shared_memory, so nothing but tile bounds is pickled.
+    The bodies are split into row tiles of TILE_ROWS bodies; each tile
+    writes its own rows of the result, and tile energies are summed in tile
+    order, so results depend neither on scheduling nor on the number of
+    workers.
+
+        with ParallelPairs(system, workers=8) as pairs:
+            pairs.advance(dt, steps)
+            e = pairs.energy()
+    """
+
+    def __init__(self, system, workers=None, tile_rows=TILE_ROWS):
+        self.system = system
+        self.workers = workers or os.cpu_count()
+        n = len(system)
+        self.tiles = [(start, min(start + tile_rows, n)) for start in range(0, n, tile_rows)]
+        self._shm = {}
+        self.pool = None
+
+    def __enter__(self):
+        system = self.system
+        arrays = {"pos": system.pos, "mass": system.mass, "acc": np.zeros_like(system.pos)}
+        views = {}
+        for key, array in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            views[key] = np.ndarray(array.shape, dtype=np.float64, buffer=shm.buf)
+            views[key][...] = array
+            self._shm[key] = shm
+        # The system now works directly on the shared arrays.
+        system.pos, system.mass = views["pos"], views["mass"]
+        self.acc = views["acc"]
+        if os.name == "posix":  # forked workers must reuse this tracker, not unlink the arrays
+            resource_tracker.ensure_running()
+        names = {key: shm.name for key, shm in self._shm.items()}
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_attach_worker, initargs=(names, len(system)))
+        return self
+
+    def __exit__(self, *exc):
+        self.pool.shutdown()
+        system = self.system
+        system.pos, system.mass = system.pos.copy(), system.mass.copy()
+        self.acc = None
+        for shm in self._shm.values():
+            shm.close()
+            shm.unlink()
+        self._shm = {}
+
+    def accelerations(self):
+        """(N, 3) exact accelerations, computed tile by tile in the pool."""
+        for future in [self.pool.submit(_tile_accel, *tile) for tile in self.tiles]:
+            future.result()
+        return self.acc.copy()
+
+    def energy(self):
+        """Exact total energy; tile potentials are reduced in a fixed order."""
+        futures = [self.pool.submit(_tile_potential, *tile) for tile in self.tiles]
+        return self.system.kinetic_energy() + math.fsum(f.result() for f in futures)
+
+    def advance(self, dt, steps=1):
+        """Same steps as NBodySystem.advance, with parallel accelerations."""
+        system = self.system
+        for _ in range(steps):
+            for future in [self.pool.submit(_tile_accel, *tile) for tile in self.tiles]:
+                future.result()
+            system.vel += dt * self.acc
+            system.pos += dt * system.vel
+
+
+def parallel_scaling(n=4000, steps=2, max_workers=None):
+    """
+    Strong scaling of ParallelPairs on a fixed random system: time per step
+    and efficiency T1 / (p * Tp) from 1 to max_workers (default: all cores),
+    checking that every worker count gives bit-identical energies.
+    """
+    max_workers = max_workers or os.cpu_count()
+    print(f"N = {n}")
+    print(f"{'workers':>8}{'ms/step':>12}{'speedup':>10}{'efficiency':>12}  energy")
+    base = reference = None
+    for workers in range(1, max_workers + 1):
+        system = NBodySystem.random(n)
+        with ParallelPairs(system, workers) as pairs:
+            pairs.accelerations()  # start the workers before timing
+            start = time.perf_counter()
+            pairs.advance(0.001, steps)
+            elapsed = (time.perf_counter() - start) / steps
+            energy = pairs.energy()
+        base = base or elapsed
+        reference = energy if reference is None else reference
+        same = "identical" if energy == reference else f"DIFFERS ({energy!r})"
+        print(f"{workers:>8}{elapsed * 1e3:>12.1f}{base / elapsed:>10.2f}"
+              f"{base / (workers * elapsed):>12.2f}  {energy!r} {same}")
+
+
+def verify_soa():
+    """The five-body energy check of benchmark_body, through NBodySystem."""
+    system = NBodySystem.from_bodies(solar_bodies)
+    system.offset_momentum()
+    tot_e = 0.0
+    for _ in range(100):
+        tot_e += system.energy()
+    return abs(tot_e - EXPECTED_ENERGY) < 1e-9
+
+
 if __name__ == "__main__":
-    ok = benchmark_body(1)
-    print("Verification:", "PASS" if ok else "FAIL")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bodies", type=int,
+                        help="simulate this many random bodies with NBodySystem")
+    parser.add_argument("--dt", type=float, default=0.01, help="timestep")
+    parser.add_argument("--steps", type=int, default=10, help="integration steps")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random system")
+    parser.add_argument("--theta", type=float,
+                        help="use the Barnes-Hut approximation with this opening angle")
+    parser.add_argument("--bh-benchmark", action="store_true",
+                        help="time per step and energy error of Barnes-Hut versus exact as N grows")
+    parser.add_argument("--workers", type=int,
+                        help="compute the exact interactions in this many processes (0 = all cores)")
+    parser.add_argument("--scaling", action="store_true",
+                        help="strong-scaling report of the parallel mode from 1 to all cores")
+    parser.add_argument("--memory", action="store_true",
+                        help="bytes per body of Body objects versus BodySystem (1M bodies by default)")
+    args = parser.parse_args()
+
+    if args.memory:
+        memory_benchmark(args.bodies or 1_000_000)
+    elif args.scaling:
+        parallel_scaling(args.bodies or 4000)
+    elif args.bh_benchmark:
+        barnes_hut_benchmark(theta=THETA if args.theta is None else args.theta)
+    elif args.bodies and args.workers is not None:
+        system = NBodySystem.random(args.bodies, args.seed)
+        system.offset_momentum()
+        with ParallelPairs(system, args.workers or None) as pairs:
+            e0 = pairs.energy()
+            start = time.perf_counter()
+            pairs.advance(args.dt, args.steps)
+            elapsed = time.perf_counter() - start
+            e1 = pairs.energy()
+        print(f"{args.bodies} bodies, {args.steps} steps of dt={args.dt}, {pairs.workers} workers: "
+              f"{elapsed / args.steps * 1e3:.3f} ms/step")
+        print(f"Energy: {e0:.12f} -> {e1:.12f} (relative drift {abs((e1 - e0) / e0):.3e})")
+    elif args.bodies:
+        system = NBodySystem.random(args.bodies, args.seed)
+        system.offset_momentum()
+        e0 = system.energy(args.theta)
+        start = time.perf_counter()
+        system.advance(args.dt, args.steps, args.theta)
+        elapsed = time.perf_counter() - start
+        e1 = system.energy(args.theta)
+        print(f"{args.bodies} bodies, {args.steps} steps of dt={args.dt}: "
+              f"{elapsed / args.steps * 1e3:.3f} ms/step")
+        print(f"Energy: {e0:.12f} -> {e1:.12f} (relative drift {abs((e1 - e0) / e0):.3e})")
+    else:
+        ok = benchmark_body(1)
+        print("Verification:", "PASS" if ok else "FAIL")
+        print("Verification (BodySystem):", "PASS" if verify_compact() else "FAIL")
+        if np is not None:
+            print("Verification (NBodySystem):", "PASS" if verify_soa() else "FAIL")
@@ -4,6 +4,25 @@
 # THIS IS THE CORRECTED VERSION.
 #
 
+import argparse
+import collections
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only needed by sha256_many
+    np = None
+
+try:
+    import resource
+except ImportError:  # Unix only, used for the peak RSS of throughput_benchmark
+    resource = None
+
 # --- Constants and Initial Values ---
 
 # This scale factor will be changed to equalize the runtime of the benchmarks.
@@ -78,12 +97,28 @@ def S1(x):
     return rotl32(x, 26) ^ rotl32(x, 21) ^ rotl32(x, 7)
 
 
+# Big-endian unpacking of the 16 message words of a block in one call
+_unpack_block = struct.Struct('>16I').unpack_from
+
+# Compression engines selectable per context
+COMPRESS_ENGINES = ("faithful", "fast")
+
+
 # --- Core SHA-256 Implementation ---
 
 class Sha256Ctx:
     """A class that holds the SHA-256 context, equivalent to sha256_ctx struct."""
 
-    def __init__(self):
+    def __init__(self, engine="faithful"):
+        """
+        'engine' selects the compression function: "faithful" is the
+        macro-by-macro port (_compress), "fast" the inlined one (_compress_fast).
+        """
+        if engine not in COMPRESS_ENGINES:
+            raise ValueError(f"unknown SHA-256 engine: {engine!r}")
+        self.engine = engine
+        if engine == "fast":
+            self._compress = self._compress_fast
         self.state = [0] * _SHA256_DIGEST_LENGTH
         self.block = bytearray(SHA256_BLOCK_SIZE)
         self.index = 0
@@ -134,11 +169,68 @@ class Sha256Ctx:
         self.state[6] = (self.state[6] + g) & 0xFFFFFFFF
         self.state[7] = (self.state[7] + h) & 0xFFFFFFFF
 
+    def _compress_fast(self, block_data):
+        """
+        Same result as _compress, with the helper functions inlined: the 16
+        words are unpacked with one struct call, the whole 64-word message
+        schedule is expanded (and K added) before the rounds, and the
+        rotations are written as shifts (ROTL32(x, n) == ROTR(x, 32 - n)).
+        """
+        w = list(_unpack_block(block_data))
+        for i in range(16, 64):
+            x = w[i - 15]
+            y = w[i - 2]
+            w.append((w[i - 16] + w[i - 7]
+                      + (((x >> 7) | (x << 25)) ^ ((x >> 18) | (x << 14)) ^ (x >> 3))
+                      + (((y >> 17) | (y << 15)) ^ ((y >> 19) | (y << 13)) ^ (y >> 10))) & 0xFFFFFFFF)
+
+        a, b, c, d, e, f, g, h = self.state
+
+        for kw in map(int.__add__, K, w):
+            t1 = (h + kw + (g ^ (e & (f ^ g)))
+                  + ((((e >> 6) | (e << 26)) ^ ((e >> 11) | (e << 21)) ^ ((e >> 25) | (e << 7))) & 0xFFFFFFFF))
+            t2 = ((((a >> 2) | (a << 30)) ^ ((a >> 13) | (a << 19)) ^ ((a >> 22) | (a << 10))) & 0xFFFFFFFF) \
+                + ((a & b) ^ (c & (a ^ b)))
+            h = g
+            g = f
+            f = e
+            e = (d + t1) & 0xFFFFFFFF
+            d = c
+            c = b
+            b = a
+            a = (t1 + t2) & 0xFFFFFFFF
+
+        state = self.state
+        state[0] = (state[0] + a) & 0xFFFFFFFF
+        state[1] = (state[1] + b) & 0xFFFFFFFF
+        state[2] = (state[2] + c) & 0xFFFFFFFF
+        state[3] = (state[3] + d) & 0xFFFFFFFF
+        state[4] = (state[4] + e) & 0xFFFFFFFF
+        state[5] = (state[5] + f) & 0xFFFFFFFF
+        state[6] = (state[6] + g) & 0xFFFFFFFF
+        state[7] = (state[7] + h) & 0xFFFFFFFF
+
+    def copy(self):
+        """
+        Returns an independent context with the same internal state (the
+        'midstate'), so hashing can continue from here more than once.
+        """
+        other = Sha256Ctx(self.engine)
+        other.state = list(self.state)
+        other.block = bytearray(self.block)
+        other.index = self.index
+        other.total_length = self.total_length
+        return other
+
     def update(self, data):
         """
         Processes input data, buffering and calling _compress as needed.
         Corresponds to sha256_update and the MD_UPDATE macro logic.
+        Accepts any buffer (bytes, bytearray, memoryview, mmap, ...); full
+        blocks are passed to _compress as memoryview slices, so only the
+        bytes of a partial block are ever copied.
         """
+        data = memoryview(data).cast('B')
         data_len = len(data)
         self.total_length += data_len  # CORRECTION: Update total length
         data_pos = 0
@@ -196,6 +288,225 @@ class Sha256Ctx:
         return digest_bytes
 
 
+def hash_file(path, engine="fast"):
+    """
+    SHA-256 digest of a file. The file is memory-mapped and hashed in place,
+    so memory use stays flat whatever the file size.
+    """
+    ctx = Sha256Ctx(engine)
+    ctx.init()
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ctx.digest()  # empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            ctx.update(mapped)
+    return ctx.digest()
+
+
+class MidstateCache:
+    """
+    LRU-bounded cache of contexts that have absorbed a given prefix.
+    hash(prefix, suffix) resumes from the cached midstate of 'prefix'
+    (compressing it only on a miss) instead of re-hashing prefix + suffix.
+    """
+
+    def __init__(self, maxsize=128, engine="fast"):
+        self.maxsize = maxsize
+        self.engine = engine
+        self.contexts = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def context(self, prefix):
+        """A fresh copy of the context after update(prefix)."""
+        key = bytes(prefix)
+        ctx = self.contexts.get(key)
+        if ctx is None:
+            self.misses += 1
+            ctx = Sha256Ctx(self.engine)
+            ctx.init()
+            ctx.update(key)
+            self.contexts[key] = ctx
+            if len(self.contexts) > self.maxsize:
+                self.contexts.popitem(last=False)
+        else:
+            self.hits += 1
+            self.contexts.move_to_end(key)
+        return ctx.copy()
+
+    def hash(self, prefix, suffix):
+        """SHA-256 digest of prefix + suffix."""
+        ctx = self.context(prefix)
+        ctx.update(suffix)
+        return ctx.digest()
+
+
+def midstate_benchmark(prefix_lengths=(64, 256, 1024, 4096, 16384), messages=50, engine="fast"):
+    """
+    Hashes 'messages' messages sharing a common prefix, once from scratch
+    and once through a MidstateCache, and prints the gain per prefix length.
+    """
+    suffixes = [i.to_bytes(4, 'big') + msg for i in range(messages)]
+    print(f"{'prefix':>8}{'plain (s)':>12}{'midstate (s)':>14}{'speedup':>10}")
+    for length in prefix_lengths:
+        prefix = (msg * (length // len(msg) + 1))[:length]
+
+        start = time.perf_counter()
+        ctx = Sha256Ctx(engine)
+        ctx.init()
+        plain = []
+        for suffix in suffixes:
+            ctx.update(prefix + suffix)
+            plain.append(ctx.digest())
+        plain_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cache = MidstateCache(engine=engine)
+        cached = [cache.hash(prefix, suffix) for suffix in suffixes]
+        cached_time = time.perf_counter() - start
+
+        assert cached == plain
+        print(f"{length:>8}{plain_time:>12.3f}{cached_time:>14.3f}{plain_time / cached_time:>10.2f}")
+
+
+# --- Batch hashing with NumPy lanes ---
+
+# Round constants as uint32, broadcast against the lanes
+_K_LANES = np.array(K, dtype=np.uint32) if np is not None else None
+
+
+def sha256_pad(message):
+    """Message followed by SHA-256 padding (0x80, zeros, 64-bit bit length)."""
+    pad_len = (55 - len(message)) % SHA256_BLOCK_SIZE
+    return bytes(message) + b'\x80' + bytes(pad_len) + (len(message) * 8).to_bytes(8, 'big')
+
+
+def _rotr(x, n):
+    """32-bit rotate right of a uint32 array."""
+    return (x >> np.uint32(n)) | (x << np.uint32(32 - n))
+
+
+def _compress_lanes(state, words):
+    """
+    One compression for every lane at once: 'state' is an (8, N) uint32
+    array, 'words' the (16, N) message words of the current block of each
+    lane. uint32 arithmetic wraps mod 2**32 like the scalar & 0xFFFFFFFF.
+    """
+    w = list(words)
+    for i in range(16, 64):
+        x = w[i - 15]
+        y = w[i - 2]
+        w.append(w[i - 16] + w[i - 7]
+                 + (_rotr(x, 7) ^ _rotr(x, 18) ^ (x >> np.uint32(3)))
+                 + (_rotr(y, 17) ^ _rotr(y, 19) ^ (y >> np.uint32(10))))
+
+    a, b, c, d, e, f, g, h = state
+    for i in range(64):
+        t1 = h + (_rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)) + (g ^ (e & (f ^ g))) + _K_LANES[i] + w[i]
+        t2 = (_rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)) + ((a & b) ^ (c & (a ^ b)))
+        h, g, f, e, d, c, b, a = g, f, e, d + t1, c, b, a, t1 + t2
+    state += np.stack((a, b, c, d, e, f, g, h))
+
+
+def sha256_many(messages):
+    """
+    SHA-256 digests of many messages, identical to hashing each one with
+    Sha256Ctx. Messages with the same padded block count are packed into
+    a (N, blocks, 16) uint32 array and compressed together, the 64 rounds
+    running vectorized across the N lanes. Without NumPy the messages are
+    hashed one by one with the fast scalar engine.
+    """
+    messages = list(messages)
+    if np is None:
+        ctx = Sha256Ctx("fast")
+        ctx.init()
+        digests = []
+        for message in messages:
+            ctx.update(message)
+            digests.append(bytes(ctx.digest()))
+        return digests
+
+    groups = {}
+    for index, message in enumerate(messages):
+        padded = sha256_pad(message)
+        groups.setdefault(len(padded) // SHA256_BLOCK_SIZE, []).append((index, padded))
+
+    digests = [None] * len(messages)
+    for blocks, members in groups.items():
+        data = np.frombuffer(b''.join(padded for _, padded in members), dtype='>u4')
+        # (blocks, 16, N): one contiguous row of N words per round input.
+        words = data.astype(np.uint32).reshape(len(members), blocks, 16).transpose(1, 2, 0).copy()
+        state = np.repeat(np.array(H0, dtype=np.uint32)[:, None], len(members), axis=1)
+        for block in range(blocks):
+            _compress_lanes(state, words[block])
+        out = state.T.astype('>u4').tobytes()
+        for lane, (index, _) in enumerate(members):
+            digests[index] = out[lane * SHA256_DIGEST_SIZE:(lane + 1) * SHA256_DIGEST_SIZE]
+    return digests
+
+
+def batch_benchmark(count=4096, length=56):
+    """Compares sha256_many with the scalar fast engine on 'count' messages."""
+    messages = [i.to_bytes(4, 'big') * (length // 4) for i in range(count)]
+
+    start = time.perf_counter()
+    ctx = Sha256Ctx("fast")
+    ctx.init()
+    scalar = []
+    for message in messages:
+        ctx.update(message)
+        scalar.append(bytes(ctx.digest()))
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = sha256_many(messages)
+    batch_time = time.perf_counter() - start
+
+    assert batch == scalar
+    print(f"{count} messages of {length} bytes: scalar {scalar_time:.3f} s, "
+          f"batch {batch_time:.3f} s ({'NumPy' if np is not None else 'no NumPy'}), "
+          f"speedup {scalar_time / batch_time:.1f}x")
+
+
+# --- Throughput Benchmark ---
+
+THROUGHPUT_SIZES = [1 << 10, 1 << 15, 1 << 20, 1 << 25, 1 << 30]  # 1 KiB .. 1 GiB
+
+
+def peak_rss_mib():
+    """Peak resident set size of this process in MiB, or None where unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in KiB on Linux and the BSDs.
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def throughput_benchmark(sizes=THROUGHPUT_SIZES, engine="fast"):
+    """
+    Hashes temporary files of the given sizes with hash_file and prints
+    MB/s and the peak RSS of the process (Unix only), which should not grow
+    with the input size. (Pure Python: the 1 GiB case takes a long time.)
+    """
+    chunk = bytes(range(256)) * 4096  # 1 MiB written repeatedly
+    print(f"{'size':>12}{'time (s)':>12}{'MB/s':>10}{'peak RSS (MiB)':>16}")
+    for size in sizes:
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            path = f.name
+            written = 0
+            while written < size:
+                written += f.write(chunk[:size - written])
+        try:
+            start = time.perf_counter()
+            hash_file(path, engine)
+            elapsed = time.perf_counter() - start
+        finally:
+            os.remove(path)
+        peak = peak_rss_mib()
+        peak = "-" if peak is None else f"{peak:.1f}"
+        print(f"{size:>12}{elapsed:>12.3f}{size / 1e6 / elapsed:>10.3f}{peak:>16}")
+
+
 # --- Benchmark Setup and Execution ---
 
 # The message to be hashed, as a bytes object
@@ -212,10 +523,10 @@ expected_hash = bytes([
 buffer = bytearray(SHA256_DIGEST_SIZE)
 
 
-def benchmark_body(rpt):
+def benchmark_body(rpt, engine="faithful"):
     """The main benchmark loop."""
     global buffer
-    ctx = Sha256Ctx()
+    ctx = Sha256Ctx(engine)
     for _ in range(rpt):
         ctx.init()
         ctx.update(msg)
@@ -232,8 +543,35 @@ def verify_benchmark(res):
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", choices=COMPRESS_ENGINES, default="faithful",
+                        help="SHA-256 compression function to benchmark")
+    parser.add_argument("--file", help="print the SHA-256 of a file instead of running the benchmark")
+    parser.add_argument("--throughput", action="store_true",
+                        help="measure MB/s of hash_file on 1 KiB .. --max-size inputs")
+    parser.add_argument("--max-size", type=int, default=THROUGHPUT_SIZES[-1],
+                        help="largest input for --throughput, in bytes")
+    parser.add_argument("--midstate", action="store_true",
+                        help="compare prefix + suffix hashing with and without the midstate cache")
+    parser.add_argument("--batch", type=int, metavar="N",
+                        help="compare sha256_many on N messages with the scalar engine")
+    args = parser.parse_args()
+
+    if args.file:
+        print(hash_file(args.file, args.engine).hex(), args.file)
+        return
+    if args.throughput:
+        throughput_benchmark([s for s in THROUGHPUT_SIZES if s <= args.max_size], args.engine)
+        return
+    if args.midstate:
+        midstate_benchmark(engine=args.engine)
+        return
+    if args.batch:
+        batch_benchmark(args.batch)
+        return
+
     rpt = LOCAL_SCALE_FACTOR * CPU_MHZ
-    result = benchmark_body(rpt)
+    result = benchmark_body(rpt, args.engine)
 
     print(f"Final result code: {result}")
     verify_benchmark(result)
@@ -1,13 +1,25 @@
 # primecount.py
+import argparse
+import concurrent.futures
+import itertools
+import json
+import math
+import os
+import time
 
 # Constants (matching the C definitions)
 LOCAL_SCALE_FACTOR = 1
 SZ = 42               # Size of sieve/primes arrays
 NPRIMES = 3512        # Expected number of primes
 
-def count_primes():
+# The incremental sieve stops once trial reaches the square of its last
+# (SZ-th) prime, 181, so it counts the primes below 181 * 181.
+BENCHMARK_LIMIT = 181 * 181
+
+def count_primes_incremental():
     """
     Counts the number of prime numbers using a custom sieve method.
+    (The original benchmark algorithm; bounded by the SZ stored primes.)
     """
     primes = [0] * SZ   # Array to store primes
     sieve = [0] * SZ    # Array to store sieve multiples
@@ -48,16 +60,203 @@ def count_primes():
     return n_primes
 
 
-def benchmark_body(rpt):
+# ---------------------------------------------------------------
+# Segmented sieve engine
+# ---------------------------------------------------------------
+
+# Odd numbers per segment: one byte each, so a segment is 2 MB however
+# large the limit is.
+SEGMENT_SIZE = 1 << 21
+
+# Wheel: the odd numbers repeat their residues mod 3, 5 and 7 every 105
+# entries, so segments start from a pre-sieved copy of this pattern
+# (entry k stands for 1 + 2k) and only primes >= 11 are crossed off.
+WHEEL_PRIMES = (3, 5, 7)
+WHEEL_PERIOD = 3 * 5 * 7
+WHEEL_PATTERN = bytes(int(all((1 + 2 * k) % p for p in WHEEL_PRIMES)) for k in range(WHEEL_PERIOD))
+
+
+def base_primes(limit):
+    """Odd primes p >= 11 with p * p < limit: the primes that sieve [0, limit)."""
+    root = math.isqrt(max(limit - 1, 0))
+    # Plain odd-only sieve of [0, root]; entry k stands for 2k + 1.
+    flags = bytearray([1]) * (root // 2 + 1)
+    flags[0] = 0
+    for k in range(1, (math.isqrt(root) - 1) // 2 + 1):
+        if flags[k]:
+            p = 2 * k + 1
+            start = p * p // 2
+            flags[start::p] = bytes(len(range(start, len(flags), p)))
+    return [2 * k + 1 for k in itertools.compress(range(len(flags)), flags) if 2 * k + 1 > 7]
+
+
+def sieve_segment(lo, hi, primes):
+    """
+    Sieves the odd numbers of [lo, hi) (lo odd) with the base primes of hi.
+    Returns a bytearray whose entry k is 1 when lo + 2k is prime.
+    """
+    size = (hi - lo + 1) // 2
+    offset = ((lo - 1) // 2) % WHEEL_PERIOD
+    flags = bytearray((WHEEL_PATTERN * (size // WHEEL_PERIOD + 2))[offset:offset + size])
+    zeros = memoryview(bytes(size))
+    for p in primes:
+        first = p * p
+        if first >= hi:
+            break
+        if first < lo:
+            first = (lo + p - 1) // p * p
+            if not first & 1:
+                first += p
+        start = (first - lo) // 2
+        if start < size:
+            flags[start::p] = zeros[:(size - 1 - start) // p + 1]
+    # 1 is not prime; the wheel primes were crossed off by the pattern.
+    if lo == 1 and size:
+        flags[0] = 0
+    for p in WHEEL_PRIMES:
+        if lo <= p < hi:
+            flags[(p - lo) // 2] = 1
+    return flags
+
+
+def _segments(lo, hi, segment_size):
+    """Splits [lo, hi) into odd-aligned ranges of segment_size odd numbers."""
+    lo = max(lo, 1) | 1
+    for start in range(lo, hi, 2 * segment_size):
+        yield start, min(start + 2 * segment_size, hi)
+
+
+def count_range(lo, hi, primes=None, segment_size=SEGMENT_SIZE):
+    """Number of primes in [lo, hi); 'primes' defaults to base_primes(hi)."""
+    if primes is None:
+        primes = base_primes(hi)
+    count = 1 if lo <= 2 < hi else 0
+    for start, stop in _segments(lo, hi, segment_size):
+        count += sieve_segment(start, stop, primes).count(1)
+    return count
+
+
+def count_primes(limit, segment_size=SEGMENT_SIZE):
+    """
+    Number of primes below 'limit', by a segmented, odd-only sieve with a
+    3-5-7 wheel. Memory use is one segment plus the primes below
+    sqrt(limit), so limits up to 10**10 and beyond are fine.
+    """
+    return count_range(0, limit, segment_size=segment_size)
+
+
+def primes_in_range(lo, hi, segment_size=SEGMENT_SIZE):
+    """List of the primes in [lo, hi)."""
+    primes = base_primes(hi)
+    result = [2] if lo <= 2 < hi else []
+    for start, stop in _segments(lo, hi, segment_size):
+        flags = sieve_segment(start, stop, primes)
+        result.extend(itertools.compress(range(start, stop, 2), flags))
+    return result
+
+
+# ---------------------------------------------------------------
+# Parallel counting with a per-block disk cache
+# ---------------------------------------------------------------
+
+# Numbers per work item of count_parallel. Blocks are aligned to multiples
+# of this size, so a later run with a larger limit finds the same blocks in
+# the cache and only sieves the new ones.
+BLOCK_SIZE = 1 << 26
+# Default cache file (next to this file).
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "primecount_cache.json")
+
+# Base primes of the current count, set once per worker by the initializer.
+_worker_primes = []
+
+
+def _init_worker(primes):
+    global _worker_primes
+    _worker_primes = primes
+
+
+def _count_block(lo, hi):
+    """Worker: number of primes in [lo, hi) with the shared base primes."""
+    return count_range(lo, hi, _worker_primes)
+
+
+def load_cache(path=CACHE_FILE):
+    """Block counts keyed by 'lo:hi', or an empty dict without a cache file."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_cache(cache, path=CACHE_FILE):
+    """Writes the block counts; the rename keeps the file whole if interrupted."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def count_parallel(limit, workers=None, cache_path=CACHE_FILE, block_size=BLOCK_SIZE):
+    """
+    Number of primes below 'limit', with [0, limit) split into blocks that
+    a process pool sieves independently. The base primes are computed once
+    and handed to every worker at startup. Complete blocks are cached on
+    disk, so only blocks missing from the cache are computed; cache_path=None
+    disables the cache. Returns (count, computed blocks, cached blocks).
+    """
+    blocks = [(lo, min(lo + block_size, limit)) for lo in range(0, limit, block_size)]
+    cache = load_cache(cache_path)
+    counts = {}
+    todo = []
+    for lo, hi in blocks:
+        key = f"{lo}:{hi}"
+        if key in cache:
+            counts[key] = cache[key]
+        else:
+            todo.append((lo, hi))
+    if todo:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers or os.cpu_count(),
+                initializer=_init_worker, initargs=(base_primes(limit),)) as pool:
+            futures = {pool.submit(_count_block, lo, hi): f"{lo}:{hi}" for lo, hi in todo}
+            for future in concurrent.futures.as_completed(futures):
+                counts[futures[future]] = future.result()
+                # Only whole blocks can be reused by a larger limit.
+                lo, hi = map(int, futures[future].split(":"))
+                if cache_path and hi - lo == block_size:
+                    cache[futures[future]] = counts[futures[future]]
+                    save_cache(cache, cache_path)
+    return sum(counts.values()), len(todo), len(blocks) - len(todo)
+
+
+# Engines selectable for benchmark_body.
+ENGINES = {
+    "incremental": count_primes_incremental,
+    "sieve": lambda: count_primes(BENCHMARK_LIMIT),
+}
+
+
+def benchmark_body(rpt, engine="incremental"):
     """
     Repeats the prime counting benchmark 'rpt' times.
     """
+    count = ENGINES[engine]
     r = 0
     for _ in range(rpt):
-        r = count_primes()
+        r = count()
     return r
 
 
+def scaling_benchmark(max_exponent=10):
+    """Time and prime count of count_primes(10**e) for e = 4 .. max_exponent."""
+    print(f"{'limit':>14}{'primes':>14}{'seconds':>10}")
+    for exponent in range(4, max_exponent + 1):
+        start = time.perf_counter()
+        count = count_primes(10 ** exponent)
+        print(f"{'10^' + str(exponent):>14}{count:>14}{time.perf_counter() - start:>10.3f}")
+
+
 def warm_caches(heat):
     """
     Simulates warming up caches by running the benchmark.
@@ -87,7 +286,33 @@ def verify_benchmark(result):
 
 
 if __name__ == "__main__":
-    # Example execution
-    result = benchmark(1)  # CPU_MHZ assumed = 1 for Python
-    print("Primes counted:", result)
-    print("Verification:", "PASS" if verify_benchmark(result) else "FAIL")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="incremental",
+                        help="prime counting engine of the benchmark")
+    parser.add_argument("--limit", type=int, help="count the primes below this bound with the sieve")
+    parser.add_argument("--scaling", type=int, metavar="E",
+                        help="time count_primes(10**e) for e = 4 .. E")
+    parser.add_argument("--workers", type=int,
+                        help="count below --limit in this many processes (0 = all cores), "
+                             "reusing blocks cached by earlier runs")
+    parser.add_argument("--cache", default=CACHE_FILE, help="block cache file of the parallel mode")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the block cache")
+    args = parser.parse_args()
+
+    if args.scaling:
+        scaling_benchmark(args.scaling)
+    elif args.limit is not None and args.workers is not None:
+        start = time.perf_counter()
+        count, computed, cached = count_parallel(args.limit, args.workers or None,
+                                                 None if args.no_cache else args.cache)
+        print(f"Primes below {args.limit}: {count} ({time.perf_counter() - start:.3f} s, "
+              f"{computed} blocks sieved, {cached} from cache)")
+    elif args.limit is not None:
+        start = time.perf_counter()
+        count = count_primes(args.limit)
+        print(f"Primes below {args.limit}: {count} ({time.perf_counter() - start:.3f} s)")
+    else:
+        # Example execution
+        result = benchmark_body(LOCAL_SCALE_FACTOR, args.engine)  # CPU_MHZ assumed = 1 for Python
+        print("Primes counted:", result)
+        print("Verification:", "PASS" if verify_benchmark(result) else "FAIL")
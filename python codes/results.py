@@ -0,0 +1,184 @@
+#
+# Machine-readable results for the suite runner.
+#
+# Every result row produced by suite.py is turned into a flat record
+# (kernel, iterations, ns/iter, verify flag, host and Python metadata) that
+# can be written as JSON lines or CSV. Records can be compared against a
+# stored baseline, flagging kernels that got slower than a threshold, so an
+# interpreter upgrade that slows down e.g. md5.md5 fails the nightly run.
+#
+# Usage:  python results.py current.jsonl baseline.jsonl [--threshold 5]
+#
+
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import calibration
+
+# Default regression threshold, in percent of the baseline ns/iter.
+THRESHOLD_PERCENT = 5.0
+# Comparison statuses that fail the gate.
+FAILING = ("regression", "verify", "missing")
+
+FIELDS = [
+    "kernel", "trial", "iterations", "ns_per_iter", "wall_s", "verify",
+    "median_ns", "p95_ns", "stddev_ns", "ci_low_ns", "ci_high_ns",
+    "timestamp", "host", "machine", "processor", "cpu_count", "platform",
+    "implementation", "python",
+]
+
+
+def host_metadata():
+    """Host and interpreter details attached to every record."""
+    meta = calibration.host_info()
+    meta.update({
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+    })
+    return meta
+
+
+def to_records(rows, meta=None):
+    """Converts suite result rows (single runs or statistics) into records."""
+    if meta is None:
+        meta = host_metadata()
+    records = []
+    for row in rows:
+        record = {
+            "kernel": row["name"],
+            "trial": row.get("trial", 0),
+            "iterations": row["rpt"],
+            "verify": bool(row["verify"]),
+        }
+        if "median_ns" in row:
+            record["ns_per_iter"] = row["median_ns"]
+            for key in ("median_ns", "p95_ns", "stddev_ns", "ci_low_ns", "ci_high_ns"):
+                record[key] = row[key]
+        else:
+            record["ns_per_iter"] = row["wall"] * 1e9 / row["rpt"]
+            record["wall_s"] = row["wall"]
+        record.update(meta)
+        records.append(record)
+    return records
+
+
+def write_jsonl(records, path):
+    """Writes one JSON object per line."""
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def write_csv(records, path):
+    """Writes the records as CSV with a fixed column order."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def read_records(path):
+    """Reads records written by write_jsonl or write_csv (chosen by extension)."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            records = list(csv.DictReader(f))
+            for record in records:
+                record["ns_per_iter"] = float(record["ns_per_iter"])
+                record["verify"] = record["verify"] == "True"
+            return records
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _by_kernel(records):
+    """Median ns/iter and combined verify flag per kernel (over all trials)."""
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record["kernel"], []).append(record)
+    return {
+        name: (statistics.median(r["ns_per_iter"] for r in group), all(r["verify"] for r in group))
+        for name, group in grouped.items()
+    }
+
+
+def compare(current, baseline, threshold=THRESHOLD_PERCENT):
+    """
+    Compares two lists of records kernel by kernel. Returns a list of dicts
+    with the baseline and current ns/iter, the change in percent and a
+    status: 'regression' (slower by more than 'threshold' percent),
+    'improvement', 'ok', 'verify' (passed in the baseline, fails now),
+    'new' or 'missing'.
+    """
+    now = _by_kernel(current)
+    before = _by_kernel(baseline)
+    report = []
+    for name in sorted(set(now) | set(before)):
+        entry = {"kernel": name, "baseline_ns": None, "current_ns": None, "change": None}
+        if name not in before:
+            entry.update(current_ns=now[name][0], status="new")
+        elif name not in now:
+            entry.update(baseline_ns=before[name][0], status="missing")
+        else:
+            (cur, cur_ok), (base, base_ok) = now[name], before[name]
+            change = (cur - base) / base * 100
+            entry.update(baseline_ns=base, current_ns=cur, change=change)
+            if base_ok and not cur_ok:
+                entry["status"] = "verify"
+            elif change > threshold:
+                entry["status"] = "regression"
+            elif change < -threshold:
+                entry["status"] = "improvement"
+            else:
+                entry["status"] = "ok"
+        report.append(entry)
+    return report
+
+
+def has_failures(report, allow_missing=False):
+    """
+    True if the comparison contains a regression, a new verify failure or
+    a baseline kernel missing from the current run (unless allow_missing,
+    for runs of a subset of the kernels).
+    """
+    failing = [s for s in FAILING if not (allow_missing and s == "missing")]
+    return any(entry["status"] in failing for entry in report)
+
+
+def print_comparison(report, threshold=THRESHOLD_PERCENT, allow_missing=False):
+    """Prints a comparison report as one aligned table."""
+    def fmt(value, spec):
+        return "-" if value is None else format(value, spec)
+
+    print(f"{'kernel':<16}{'baseline ns/it':>16}{'current ns/it':>16}{'change':>10}  status")
+    for entry in report:
+        change = "-" if entry["change"] is None else f"{entry['change']:+.1f}%"
+        print(f"{entry['kernel']:<16}{fmt(entry['baseline_ns'], '.1f'):>16}"
+              f"{fmt(entry['current_ns'], '.1f'):>16}{change:>10}  {entry['status'].upper()}")
+    print(f"Threshold: {threshold:.1f}% - {'FAIL' if has_failures(report, allow_missing) else 'PASS'}")
+
+
+def main():
+    """Compares two result files and exits with 1 on any failing status."""
+    parser = argparse.ArgumentParser(description="Compare suite results against a baseline.")
+    parser.add_argument("current", help="results file (.jsonl or .csv)")
+    parser.add_argument("baseline", help="baseline results file (.jsonl or .csv)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD_PERCENT,
+                        help="allowed slowdown in percent before a kernel is flagged")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="do not fail on baseline kernels absent from the current results")
+    args = parser.parse_args()
+
+    report = compare(read_records(args.current), read_records(args.baseline), args.threshold)
+    print_comparison(report, args.threshold, args.allow_missing)
+    sys.exit(1 if has_failures(report, args.allow_missing) else 0)
+
+
+if __name__ == "__main__":
+    main()
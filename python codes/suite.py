@@ -0,0 +1,355 @@
+#
+# Single-process runner for the Python Embench ports.
+#
+# Every kernel lives in its own folder next to this file and was written as a
+# standalone script, so the entry points differ from file to file
+# (benchmark(), main(), benchmark_body(rpt), verify_benchmark() with or
+# without an argument, ...). This module loads all of them into one
+# interpreter and wraps each one in a Kernel object exposing the same
+# initialise / warm / benchmark / verify contract as the C harness.
+#
+
+import argparse
+import concurrent.futures
+import contextlib
+import importlib.util
+import inspect
+import io
+import multiprocessing
+import os
+import sys
+import time
+
+import calibration
+import results
+import timing
+
+# Folder holding the kernel sub-folders (the folder of this file).
+SUITE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Scripts that are not benchmarks in their own right:
+# crc_32-initial.py is the first (non-deterministic) draft of crc_32.py.
+EXCLUDE = {"crc_32-initial"}
+
+# CPU_MHZ used for every kernel. The per-file CPU_MHZ values are leftovers of
+# the C placeholders (1 in some files, 100 in others), so the runner ignores
+# them and scales all kernels the same way.
+CPU_MHZ = 1
+
+
+class Kernel:
+    """A loaded benchmark module behind the common Embench contract."""
+
+    def __init__(self, name, path, module):
+        self.name = name
+        self.path = path
+        self.module = module
+        # Default repetition count, like LOCAL_SCALE_FACTOR * CPU_MHZ in C.
+        self.scale = getattr(module, "LOCAL_SCALE_FACTOR", 1)
+
+    def initialise(self):
+        """Equivalent to initialise_benchmark()."""
+        init = getattr(self.module, "initialise_benchmark", None)
+        if init is not None:
+            init()
+
+    def warm(self, heat):
+        """Equivalent to warm_caches(heat); falls back to benchmark_body(heat)."""
+        warm = getattr(self.module, "warm_caches", None)
+        if warm is not None:
+            warm(heat)
+        elif heat > 0:
+            self.benchmark(heat)
+
+    def benchmark(self, rpt):
+        """Runs benchmark_body(rpt) and returns its result."""
+        return self.module.benchmark_body(rpt)
+
+    def verify(self, result):
+        """
+        Equivalent to verify_benchmark(result). Some kernels take no argument
+        and check module globals instead, and some print while verifying;
+        that output is swallowed so the suite report stays readable.
+        """
+        verify = getattr(self.module, "verify_benchmark", None)
+        if verify is None:
+            # nbody checks its energy inside benchmark_body and returns a bool.
+            return result is True
+        with contextlib.redirect_stdout(io.StringIO()):
+            if inspect.signature(verify).parameters:
+                return bool(verify(result))
+            return bool(verify())
+
+
+def _is_kernel_source(path):
+    """True if the file defines benchmark_body (checked without importing it)."""
+    with open(path, encoding="utf-8") as f:
+        return "def benchmark_body(" in f.read()
+
+
+def load_kernel(path):
+    """Imports one kernel file by path and wraps it in a Kernel."""
+    name = os.path.basename(os.path.dirname(path))
+    stem = os.path.splitext(os.path.basename(path))[0]
+    module_name = "embench_" + stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so that functions of the kernel can be pickled, e.g. to
+    # send them to a process pool.
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return Kernel(name, path, module)
+
+
+def discover(suite_dir=SUITE_DIR, only=None):
+    """
+    Finds every kernel under suite_dir (one sub-folder per benchmark) and
+    returns them as a list of Kernel objects sorted by name.
+    'only' optionally restricts the result to the given kernel names.
+    """
+    kernels = []
+    for entry in sorted(os.listdir(suite_dir)):
+        folder = os.path.join(suite_dir, entry)
+        if not os.path.isdir(folder) or entry.startswith(("_", ".")):
+            continue
+        if only and entry not in only:
+            continue
+        for filename in sorted(os.listdir(folder)):
+            stem, ext = os.path.splitext(filename)
+            path = os.path.join(folder, filename)
+            if ext != ".py" or stem in EXCLUDE or not _is_kernel_source(path):
+                continue
+            kernels.append(load_kernel(path))
+    return kernels
+
+
+def run_kernel(kernel, rpt=None, heat=0):
+    """
+    Runs one kernel through the full contract and returns a result dict
+    with the repetition count, wall time, iterations/sec and verify flag.
+    """
+    if rpt is None:
+        rpt = kernel.scale * CPU_MHZ
+    kernel.initialise()
+    kernel.warm(heat)
+    start = time.perf_counter()
+    result = kernel.benchmark(rpt)
+    wall = time.perf_counter() - start
+    return {
+        "name": kernel.name,
+        "rpt": rpt,
+        "wall": wall,
+        "ips": rpt / wall if wall > 0 else float("inf"),
+        "verify": kernel.verify(result),
+    }
+
+
+def run_row(kernel, rpt=None, heat=0, repetitions=0, target=timing.TARGET_SECONDS):
+    """
+    Single run (run_kernel) when repetitions is 0, otherwise a full
+    statistical measurement with timing.measure.
+    """
+    if repetitions:
+        return timing.measure(kernel, repetitions, rpt, target, max(heat, 1))
+    return run_kernel(kernel, rpt, heat)
+
+
+# -------------------------------
+# Process-pool execution
+# -------------------------------
+
+# Kernels already imported by this worker process, keyed by path.
+_worker_kernels = {}
+# CPU this worker is pinned to (None when pinning is off or unsupported).
+_worker_cpu = None
+
+
+def _init_worker(counter, pin):
+    """Pool initializer: optionally pins each new worker to its own CPU."""
+    global _worker_cpu
+    if not pin or not hasattr(os, "sched_setaffinity"):
+        return
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    cpus = sorted(os.sched_getaffinity(0))
+    _worker_cpu = cpus[index % len(cpus)]
+    os.sched_setaffinity(0, {_worker_cpu})
+
+
+def _worker_kernel(path, scale):
+    kernel = _worker_kernels.get(path)
+    if kernel is None:
+        kernel = _worker_kernels[path] = load_kernel(path)
+    # The parent may have replaced the scale with a calibrated one.
+    kernel.scale = scale
+    return kernel
+
+
+def _run_task(path, scale, trial, rpt, heat, repetitions, target):
+    """Runs (and verifies) one trial of one kernel inside a worker."""
+    row = run_row(_worker_kernel(path, scale), rpt, heat, repetitions, target)
+    row["trial"] = trial
+    row["cpu"] = _worker_cpu
+    return row
+
+
+def _run_neighbour(jobs, stop):
+    """Keeps a worker busy running the given (path, scale) kernels until 'stop' is set."""
+    while not stop.is_set():
+        for path, scale in jobs:
+            kernel = _worker_kernel(path, scale)
+            kernel.initialise()
+            kernel.benchmark(kernel.scale * CPU_MHZ)
+            if stop.is_set():
+                break
+
+
+def _make_pool(jobs, pin):
+    counter = multiprocessing.Value("i", 0)
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(counter, pin))
+
+
+def run_parallel(kernels, jobs=None, trials=1, rpt=None, heat=0, pin=False,
+                 repetitions=0, target=timing.TARGET_SECONDS):
+    """
+    Fans every (kernel, trial) pair out to a pool of 'jobs' worker processes
+    (default: one per CPU). Each worker imports, runs and verifies the kernel
+    itself; the result rows come back in kernel/trial order.
+    """
+    jobs = jobs or os.cpu_count()
+    with _make_pool(jobs, pin) as pool:
+        futures = [pool.submit(_run_task, k.path, k.scale, t, rpt, heat, repetitions, target)
+                   for k in kernels for t in range(trials)]
+        return [f.result() for f in futures]
+
+
+def run_noisy(kernels, jobs=None, trials=1, rpt=None, heat=0, pin=False,
+              repetitions=0, target=timing.TARGET_SECONDS):
+    """
+    Measures interference: every trial of every kernel is timed while the
+    other jobs - 1 workers keep running the remaining kernels in a loop,
+    so the measured kernel always shares the machine with busy neighbours.
+    """
+    jobs = jobs or os.cpu_count()
+    rows = []
+    with multiprocessing.Manager() as manager, _make_pool(jobs, pin) as pool:
+        for kernel in kernels:
+            others = [(k.path, k.scale) for k in kernels if k is not kernel] or [(kernel.path, kernel.scale)]
+            for trial in range(trials):
+                stop = manager.Event()
+                neighbours = []
+                for i in range(jobs - 1):
+                    # Rotate the list so neighbours do not all run the same kernel.
+                    shift = i % len(others)
+                    neighbours.append(pool.submit(_run_neighbour, others[shift:] + others[:shift], stop))
+                try:
+                    row = pool.submit(_run_task, kernel.path, kernel.scale, trial, rpt, heat,
+                                      repetitions, target).result()
+                finally:
+                    stop.set()
+                    for f in neighbours:
+                        f.result()
+                row["neighbours"] = len(neighbours)
+                rows.append(row)
+    return rows
+
+
+def print_table(rows):
+    """Prints the per-kernel results as one aligned table."""
+    print(f"{'kernel':<16}{'trial':>6}{'cpu':>5}{'rpt':>10}{'wall (s)':>12}{'iter/s':>14}  verify")
+    for row in rows:
+        cpu = row.get("cpu")
+        print(f"{row['name']:<16}{row.get('trial', 0):>6}{'-' if cpu is None else cpu:>5}"
+              f"{row['rpt']:>10}{row['wall']:>12.4f}{row['ips']:>14.1f}"
+              f"  {'OK' if row['verify'] else 'FAIL'}")
+
+
+def main():
+    """The main entry point of the program."""
+    parser = argparse.ArgumentParser(description="Run the Python Embench suite in one process.")
+    parser.add_argument("kernels", nargs="*", help="kernel names to run (default: all)")
+    parser.add_argument("--rpt", type=int, help="override the repetition count of every kernel")
+    parser.add_argument("--heat", type=int, default=0, help="warm-up repetitions before timing")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="worker processes; 0 means one per CPU (default: 1, run in-process)")
+    parser.add_argument("--trials", type=int, default=1, help="repeated trials of every kernel")
+    parser.add_argument("--pin", action="store_true", help="pin every worker process to its own CPU")
+    parser.add_argument("--noisy", action="store_true",
+                        help="time each kernel while the other workers run the rest of the suite")
+    parser.add_argument("--repetitions", "-n", type=int, default=0,
+                        help="timed samples per kernel; enables the statistics report "
+                             "(rpt is calibrated to --target unless --rpt is given)")
+    parser.add_argument("--target", type=float, default=timing.TARGET_SECONDS,
+                        help="target duration of one timed sample, in seconds")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="measure every kernel, write the calibration file and exit")
+    parser.add_argument("--budget", type=float, default=calibration.BUDGET_SECONDS,
+                        help="wall-clock budget of one calibrated run, in seconds")
+    parser.add_argument("--calibration", default=calibration.CALIBRATION_FILE,
+                        help="calibration file to write or load")
+    parser.add_argument("--no-calibration", action="store_true",
+                        help="ignore the calibration file and use LOCAL_SCALE_FACTOR")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON lines")
+    parser.add_argument("--csv", metavar="PATH", help="write the results as CSV")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare against a stored results file; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=results.THRESHOLD_PERCENT,
+                        help="allowed slowdown in percent for --compare")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="with --compare, do not fail on baseline kernels that were not run")
+    args = parser.parse_args()
+
+    kernels = discover(only=args.kernels)
+    if args.calibrate:
+        data = calibration.calibrate(kernels, args.budget)
+        if args.kernels:
+            # Keep the entries of the kernels that were not re-calibrated.
+            previous = calibration.load(args.calibration)
+            if previous is not None:
+                data["kernels"] = {**previous["kernels"], **data["kernels"]}
+        calibration.save(data, args.calibration)
+        for name, entry in sorted(data["kernels"].items()):
+            print(f"{name:<16}{entry['ns_per_iter']:>16.1f} ns/iter  scale {entry['scale']}")
+        print(f"Calibration written to {args.calibration}")
+        return
+    if not args.no_calibration:
+        data = calibration.load(args.calibration)
+        if data is not None:
+            calibration.apply(kernels, data)
+
+    start = time.perf_counter()
+    extra = {"repetitions": args.repetitions, "target": args.target}
+    if args.noisy:
+        rows = run_noisy(kernels, args.jobs or None, args.trials, args.rpt, args.heat, args.pin, **extra)
+    elif args.jobs != 1 or args.pin:
+        rows = run_parallel(kernels, args.jobs or None, args.trials, args.rpt, args.heat, args.pin, **extra)
+    else:
+        rows = []
+        for kernel in kernels:
+            for trial in range(args.trials):
+                row = run_row(kernel, args.rpt, args.heat, **extra)
+                row["trial"] = trial
+                rows.append(row)
+    if args.repetitions:
+        timing.print_stats(rows)
+    else:
+        print_table(rows)
+    print(f"Total wall time: {time.perf_counter() - start:.3f} s")
+
+    records = results.to_records(rows)
+    if args.json:
+        results.write_jsonl(records, args.json)
+    if args.csv:
+        results.write_csv(records, args.csv)
+    if args.compare:
+        report = results.compare(records, results.read_records(args.compare), args.threshold)
+        print()
+        results.print_comparison(report, args.threshold, args.allow_missing)
+        if results.has_failures(report, args.allow_missing):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#
+# Timing engine for the suite runner.
+#
+# The kernels only ever ran their LOCAL_SCALE_FACTOR * CPU_MHZ iterations
+# once, with nothing measuring time. This module warms a kernel up, picks a
+# repetition count so that every timed sample lasts a target duration, takes
+# N samples with perf_counter_ns and summarises them (median, p95, stddev
+# and a bootstrap confidence interval of the median) after dropping outliers.
+#
+
+import math
+import random
+import statistics
+import time
+
+# Default duration of one timed sample, in seconds.
+TARGET_SECONDS = 0.1
+# Default number of timed samples per kernel.
+REPETITIONS = 10
+# Bootstrap resamples used for the confidence interval.
+BOOTSTRAP_RESAMPLES = 2000
+
+
+def time_once(kernel, rpt):
+    """Runs benchmark_body(rpt) once; returns (elapsed_ns, result)."""
+    start = time.perf_counter_ns()
+    result = kernel.benchmark(rpt)
+    return time.perf_counter_ns() - start, result
+
+
+def calibrate_rpt(kernel, target=TARGET_SECONDS):
+    """
+    Finds the repetition count for which one benchmark_body(rpt) call takes
+    about 'target' seconds, by doubling rpt until a run is long enough to
+    extrapolate from.
+    """
+    target_ns = target * 1e9
+    rpt = 1
+    while True:
+        elapsed, _ = time_once(kernel, rpt)
+        # Below a tenth of the target the timer noise is too large to trust.
+        if elapsed >= target_ns / 10:
+            return max(1, round(rpt * target_ns / elapsed))
+        rpt *= 2
+
+
+def remove_outliers(samples):
+    """Drops samples outside the Tukey fences (1.5 IQR beyond the quartiles)."""
+    if len(samples) < 4:
+        return list(samples)
+    q1, _, q3 = statistics.quantiles(samples, n=4)
+    low = q1 - 1.5 * (q3 - q1)
+    high = q3 + 1.5 * (q3 - q1)
+    return [s for s in samples if low <= s <= high]
+
+
+def percentile(samples, p):
+    """Nearest-rank percentile (p in 0..100) of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def bootstrap_ci(samples, confidence=0.95, resamples=BOOTSTRAP_RESAMPLES, seed=0):
+    """Percentile-bootstrap confidence interval of the median."""
+    rng = random.Random(seed)
+    n = len(samples)
+    medians = sorted(statistics.median(rng.choices(samples, k=n)) for _ in range(resamples))
+    tail = (1 - confidence) / 2
+    low = medians[int(tail * (resamples - 1))]
+    high = medians[int(math.ceil((1 - tail) * (resamples - 1)))]
+    return low, high
+
+
+def summarise(samples, rpt):
+    """Statistics of a list of per-sample times (ns), reported per iteration."""
+    kept = remove_outliers(samples)
+    per_iter = [s / rpt for s in kept]
+    low, high = bootstrap_ci(per_iter)
+    return {
+        "samples": len(samples),
+        "outliers": len(samples) - len(kept),
+        "median_ns": statistics.median(per_iter),
+        "p95_ns": percentile(per_iter, 95),
+        "stddev_ns": statistics.stdev(per_iter) if len(per_iter) > 1 else 0.0,
+        "ci_low_ns": low,
+        "ci_high_ns": high,
+    }
+
+
+def measure(kernel, repetitions=REPETITIONS, rpt=None, target=TARGET_SECONDS, heat=1):
+    """
+    Full measurement of one kernel: initialise, warm up, calibrate rpt
+    (unless given), take 'repetitions' timed samples and verify the result
+    of the last one. Returns a result dict with the statistics in ns/iter.
+    """
+    kernel.initialise()
+    kernel.warm(heat)
+    if rpt is None:
+        rpt = calibrate_rpt(kernel, target)
+    samples = []
+    result = None
+    for _ in range(repetitions):
+        elapsed, result = time_once(kernel, rpt)
+        samples.append(elapsed)
+    row = {"name": kernel.name, "rpt": rpt, "verify": kernel.verify(result)}
+    row.update(summarise(samples, rpt))
+    row["ips"] = 1e9 / row["median_ns"] if row["median_ns"] > 0 else float("inf")
+    return row
+
+
+def print_stats(rows):
+    """Prints the timing statistics of every kernel as one aligned table."""
+    print(f"{'kernel':<16}{'rpt':>9}{'n':>4}{'out':>4}{'median ns/it':>14}{'p95':>14}"
+          f"{'stddev':>12}{'95% CI':>28}  verify")
+    for row in rows:
+        ci = f"[{row['ci_low_ns']:.1f}, {row['ci_high_ns']:.1f}]"
+        print(f"{row['name']:<16}{row['rpt']:>9}{row['samples']:>4}{row['outliers']:>4}"
+              f"{row['median_ns']:>14.1f}{row['p95_ns']:>14.1f}{row['stddev_ns']:>12.1f}"
+              f"{ci:>28}  {'OK' if row['verify'] else 'FAIL'}")
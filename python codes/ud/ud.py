@@ -1,3 +1,8 @@
+import argparse
+import operator
+import random
+import time
+
 # This scale factor will be changed to equalize the runtime of the benchmarks.
 CPU_MHZ = 100
 LOCAL_SCALE_FACTOR = 1478
@@ -60,6 +65,158 @@ def ludcmp(nmax, n):
     return 0
 
 
+class LUSolver:
+    """
+    LU factorization of an arbitrary n x n matrix, computed once and reused
+    to solve A x = b for any number of right-hand sides.
+
+    mode="int" reproduces ludcmp exactly: integer entries, '//' division and
+    no pivoting, so LUSolver(A).solve(B) gives the X of the benchmark.
+    mode="float" uses float division with partial pivoting (rows swapped to
+    put the largest remaining entry on the diagonal), for general systems.
+
+    The input matrix is copied, never modified. Solving allocates nothing
+    when an output list is passed: the intermediate vector is kept between
+    calls.
+    """
+
+    def __init__(self, matrix, mode="int"):
+        if mode not in ("int", "float"):
+            raise ValueError(f"unknown mode {mode!r}, expected 'int' or 'float'")
+        self.n = len(matrix)
+        if any(len(row) != self.n for row in matrix):
+            raise ValueError("LUSolver needs a square matrix")
+        self.mode = mode
+        self.lu = [list(row) for row in matrix]
+        # perm[i] is the row of the original system now at row i.
+        self.perm = list(range(self.n))
+        if mode == "int":
+            self._factorize_int()
+        else:
+            self.lu = [[float(v) for v in row] for row in self.lu]
+            self._factorize_float()
+        self._y = [0] * self.n
+        self._div = operator.floordiv if mode == "int" else operator.truediv
+
+    def _factorize_int(self):
+        """The decomposition phase of ludcmp, for n = self.n - 1."""
+        a, n = self.lu, self.n - 1
+        for i in range(n):
+            for j in range(i + 1, n + 1):
+                w = a[j][i]
+                for k in range(i):
+                    w -= a[j][k] * a[k][i]
+                a[j][i] = w // a[i][i]
+            for j in range(i + 1, n + 1):
+                w = a[i + 1][j]
+                for k in range(i + 1):
+                    w -= a[i + 1][k] * a[k][j]
+                a[i + 1][j] = w
+
+    def _factorize_float(self):
+        """Gaussian elimination with partial pivoting; L (unit diagonal) below U."""
+        a, perm = self.lu, self.perm
+        for i in range(self.n):
+            p = max(range(i, self.n), key=lambda r: abs(a[r][i]))
+            if a[p][i] == 0.0:
+                raise ValueError("matrix is singular")
+            if p != i:
+                a[i], a[p] = a[p], a[i]
+                perm[i], perm[p] = perm[p], perm[i]
+            pivot_row = a[i]
+            pivot = pivot_row[i]
+            for row in a[i + 1:]:
+                factor = row[i] / pivot
+                row[i] = factor
+                if factor:
+                    for k in range(i + 1, self.n):
+                        row[k] -= factor * pivot_row[k]
+
+    def solve(self, b, out=None):
+        """
+        Solution x of A x = b, written into 'out' when given (a list of
+        length n, reused as is) and returned.
+        """
+        a, y, n, div = self.lu, self._y, self.n, self._div
+        if out is None:
+            out = [0] * n
+        # Forward substitution: L y = P b.
+        for i, row in enumerate(self.perm):
+            w = b[row]
+            lu_i = a[i]
+            for j in range(i):
+                w -= lu_i[j] * y[j]
+            y[i] = w
+        # Backward substitution: U x = y.
+        for i in range(n - 1, -1, -1):
+            w = y[i]
+            lu_i = a[i]
+            for j in range(i + 1, n):
+                w -= lu_i[j] * out[j]
+            out[i] = div(w, lu_i[i])
+        return out
+
+    def solve_many(self, rhs):
+        """Solutions for an iterable of right-hand sides, one list each."""
+        return [self.solve(b) for b in rhs]
+
+
+# Largest n (last index) ludcmp can handle with its 20 x 20 globals.
+LUDCMP_MAX_N = 19
+
+
+def make_system(n):
+    """The benchmark's (n+1) x (n+1) matrix and right-hand side (exact solution: all ones)."""
+    a = [[((i + 1) + (j + 1)) * (2 if i == j else 1) for j in range(n + 1)] for i in range(n + 1)]
+    return a, [sum(row) for row in a]
+
+
+def many_rhs_benchmark(n=5, count=2000, seed=0):
+    """
+    Solves one system for 'count' right-hand sides, re-running ludcmp for
+    each (the only option before LUSolver) versus factorizing once with
+    LUSolver. ludcmp works on the 20 x 20 globals, so for n > LUDCMP_MAX_N
+    only LUSolver is timed.
+    """
+    rng = random.Random(seed)
+    matrix, _ = make_system(n)
+    rhs = [[rng.randrange(1, 1000) for _ in range(n + 1)] for _ in range(count)]
+
+    refactor = None
+    if n <= LUDCMP_MAX_N:
+        start = time.perf_counter()
+        refactor = []
+        for b in rhs:
+            for i in range(n + 1):
+                A[i][:n + 1] = matrix[i]
+                B[i] = b[i]
+            ludcmp(20, n)
+            refactor.append(X[:n + 1])
+        t_ludcmp = time.perf_counter() - start
+
+    times = {}
+    for mode in ("int", "float"):
+        start = time.perf_counter()
+        solver = LUSolver(matrix, mode)
+        out = [0] * (n + 1)
+        solutions = []
+        for b in rhs:
+            solutions.append(list(solver.solve(b, out)))
+        times[mode] = time.perf_counter() - start
+        if mode == "int" and refactor is not None:
+            same = solutions == refactor
+
+    print(f"{count} right-hand sides, {n + 1} x {n + 1} system")
+    if refactor is None:
+        print(f"{'ludcmp per vector':<24}{'-':>10}    (n > {LUDCMP_MAX_N}: beyond the 20 x 20 globals)")
+        print(f"{'LUSolver int':<24}{times['int']:>10.4f} s")
+    else:
+        print(f"{'ludcmp per vector':<24}{t_ludcmp:>10.4f} s")
+        print(f"{'LUSolver int':<24}{times['int']:>10.4f} s  ({t_ludcmp / times['int']:.1f}x, "
+              f"{'same X' if same else 'DIFFERENT X'})")
+    print(f"{'LUSolver float':<24}{times['float']:>10.4f} s")
+
+
 def benchmark_body(rpt):
     """
     The main body of the benchmark. It initializes a matrix and vector,
@@ -108,6 +265,17 @@ def verify_benchmark(res):
 
 def main():
     """The main entry point of the program."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--many-rhs", type=int, metavar="COUNT",
+                        help="time COUNT right-hand sides: ludcmp each time vs one LUSolver")
+    parser.add_argument("--n", type=int, default=5, help="last index of the system (size n + 1)")
+    args = parser.parse_args()
+    if args.n < 0:
+        parser.error("--n must be at least 0")
+    if args.many_rhs:
+        many_rhs_benchmark(args.n, args.many_rhs)
+        return
+
     rpt = LOCAL_SCALE_FACTOR * CPU_MHZ
     result = benchmark_body(rpt)
 